@@ -20,6 +20,7 @@ developer_qr_path = project_root / "developer_qr.png"
 
 all_datas = []
 all_datas.append((str(project_root / "icon_tray.png"), "."))
+all_datas.append((str(project_root / "theme.qss"), "."))
 if developer_qr_path.exists():
     all_datas.append((str(developer_qr_path), "."))
 all_binaries = []
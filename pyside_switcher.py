@@ -6,21 +6,29 @@ from __future__ import annotations
 import sys
 import json
 import base64
+import calendar
 import os
 import subprocess
 import re
 import shutil
+import stat
 import threading
 import ctypes
+import gzip
 import time
 import html
+import http.client
+import itertools
+import mmap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from ctypes import wintypes
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Dict, List, Optional
 from urllib import request as urllib_request
 from urllib import error as urllib_error
-from urllib.parse import quote as urlquote, urlparse
+from urllib.parse import quote as urlquote, unquote, urljoin, urlparse
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -35,6 +43,16 @@ try:
 except Exception:
     apply_stylesheet = None
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None
+
 from codex_switcher import (
     build_accounts,
     check_codex_available,
@@ -99,6 +117,83 @@ STATUS_TEXT = {
     "unknown": "未知",
 }
 
+_JS_SET_RE = re.compile(r'([A-Za-z_$][\w$]*)=new Set\(\[(.*?)\]\)', re.S)
+_JS_STRING_RE = re.compile(r'["\']([^"\']+)["\']')
+_SUE_SET_RE = re.compile(r"SUe=new Set\(\[(.*?)\]\)")
+_MODEL_ORDER_RE = re.compile(r'(MODEL_ORDER_BY_AUTH_METHOD\s*=\s*\{.*?apikey\s*:\s*\[)(.*?)(\])', re.S)
+_AUTH_ONLY_SET_RE = re.compile(r'CHAT_GPT_AUTH_ONLY_MODELS\s*=\s*new Set\(\[(.*?)\]\)', re.S)
+_AUTH_GUARD_ALREADY_RE = re.compile(
+    r'[A-Za-z_$][\w$]*!=="apikey"\s*&&\s*!!mt\s*&&\s*CHAT_GPT_AUTH_ONLY_MODELS\.has\(normalizeModel\(mt\)\)'
+)
+_AUTH_VAR_RE = re.compile(r'([A-Za-z_$][\w$]*)===\"(?:chatgpt|apikey)\"')
+_AUTH_GUARD_SPACED_RE = re.compile(r'&&\s*!!mt\s*&&\s*CHAT_GPT_AUTH_ONLY_MODELS\.has\(normalizeModel\(mt\)\)')
+_APIKEY_GATE_RE = re.compile(
+    r'i==="chatgpt"\?!0:\(i==="copilot"\?([A-Za-z_$][\w$]*):([A-Za-z_$][\w$]*)\)\.has\(v\.model\)'
+)
+_DYNAMIC_FLOW_GATE_RE = re.compile(
+    r'i===\"chatgpt\"\s*\|\|\s*i===\"apikey\"\s*\?!0:\(i===\"copilot\"\?[A-Za-z_$][\w$]*:[A-Za-z_$][\w$]*\)\.has\(v\.model\)'
+)
+_DYNAMIC_GATE_RE = re.compile(
+    r'([A-Za-z_$][\w$]*)===\"chatgpt\"\|\|\1===\"apikey\"\?!0:\(\1===\"copilot\"\?[A-Za-z_$][\w$]*:[A-Za-z_$][\w$]*\)\.has\(([A-Za-z_$][\w$]*)\.model\)'
+)
+_MODELS_VAR_RE = re.compile(r',([A-Za-z_$][\w$]*)=\{models:\[\]\};')
+_ORDER_INJECT_PREFIX_RE = re.compile(
+    r'i==="apikey"&&\(\(\)=>\{const Y=\[([^\]]*)\],X=new Map\(Y\.map\(\(A,R\)=>\[A,R\]\)\);'
+)
+_ORDER_INJECT_ANCHOR = 'i==="apikey"&&(()=>{const Y=['
+_INITIAL_DATA_ANCHOR = 'initialData:i==="apikey"?{data:['
+_INITIAL_DATA_END = ']}:void 0'
+_ORDER_INJECTED_RE = re.compile(r'm\.models\.find\(A=>A\.model==="([^"]+)"\)\|\|m\.models\.unshift\(\{')
+_MODEL_TOKEN_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._:-]{1,120}$")
+_MODEL_SPLIT_RE = re.compile(r"[,;|\s]+")
+_MODEL_NORMALIZE_TABLE = str.maketrans({"，": ",", "；": ";"})
+_SEMVER_RE = re.compile(r"\d+\.\d+\.\d+")
+_DIGITS_RE = re.compile(r"\d+")
+_KEYWORD_SPLIT_RE = re.compile(r"[\s|]+")
+_RELEASE_HEADING_SPLIT_RE = re.compile(r"^[ \t]*##", re.M)
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+_TEXT_CONTENT_TYPES = frozenset({"input_text", "output_text", "text"})
+_SETTINGS_UPDATE_FLAG_RES = (
+    ("extensions.autoUpdate", re.compile(r'("extensions\.autoUpdate"\s*:\s*)(?:true|false|"[^"\n]*")')),
+    ("extensions.autoCheckUpdates", re.compile(r'("extensions\.autoCheckUpdates"\s*:\s*)(?:true|false)')),
+)
+_PATCH_ANCHORS = (
+    ("gate", 'i==="chatgpt"'),
+    ("auth_only", "CHAT_GPT_AUTH_ONLY_MODELS"),
+    ("order", _ORDER_INJECT_ANCHOR),
+    ("initial", _INITIAL_DATA_ANCHOR),
+    ("list_models", "listModels"),
+    ("models_by_type", "modelsByType"),
+)
+_VSCODE_APPDATA_SUBS = (
+    ("WebView",),
+    ("CachedData",),
+    ("Cache",),
+    ("GPUCache",),
+    ("Local Storage",),
+    ("Service Worker", "CacheStorage"),
+    ("Service Worker", "ScriptCache"),
+)
+_VSCODE_LOCAL_SUBS = (("User", "workspaceStorage"), ("User", "globalStorage"))
+_VSCODE_CHANNEL_NAMES = {
+    "stable": ("Code",),
+    "insiders": ("Code - Insiders",),
+    None: ("Code", "Code - Insiders"),
+}
+
+
+def _splice_edits(content: str, edits: List[tuple[int, int, str]]) -> str:
+    if not edits:
+        return content
+    parts: List[str] = []
+    prev = 0
+    for start, end, replacement in sorted(edits):
+        parts.append(content[prev:start])
+        parts.append(replacement)
+        prev = end
+    parts.append(content[prev:])
+    return "".join(parts)
+
 
 def run_in_ui(fn) -> None:
     app = QtWidgets.QApplication.instance()
@@ -108,6 +203,20 @@ def run_in_ui(fn) -> None:
     QtCore.QTimer.singleShot(0, app, fn)
 
 
+class _PoolTask(QtCore.QRunnable):
+    def __init__(self, fn) -> None:
+        super().__init__()
+        self._fn = fn
+        self.setAutoDelete(True)
+
+    def run(self) -> None:
+        self._fn()
+
+
+def run_in_pool(fn) -> None:
+    QtCore.QThreadPool.globalInstance().start(_PoolTask(fn))
+
+
 def message_info(parent: QtWidgets.QWidget, title: str, text: str) -> None:
     QtWidgets.QMessageBox.information(parent, title, text)
 
@@ -128,6 +237,31 @@ def message_error(parent: QtWidgets.QWidget, title: str, text: str) -> None:
     QtWidgets.QMessageBox.critical(parent, title, text)
 
 
+_HEADER_FONT: Optional[QtGui.QFont] = None
+
+
+def header_font() -> QtGui.QFont:
+    global _HEADER_FONT
+    if _HEADER_FONT is None:
+        font = QtGui.QFont("Segoe UI", 12)
+        font.setBold(True)
+        _HEADER_FONT = font
+    return _HEADER_FONT
+
+
+_THEME_QSS: Optional[str] = None
+
+
+def theme_qss() -> str:
+    global _THEME_QSS
+    if _THEME_QSS is None:
+        try:
+            _THEME_QSS = resolve_asset("theme.qss").read_text(encoding="utf-8")
+        except Exception:
+            _THEME_QSS = ""
+    return _THEME_QSS
+
+
 class NavBadgeButton(QtWidgets.QPushButton):
     def __init__(self, label: str) -> None:
         super().__init__(label)
@@ -179,6 +313,262 @@ def _popen_hidden_cmd_on_windows(args: List[str]):
     return subprocess.Popen(args, **popen_kwargs)
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding=encoding) as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+        raise
+
+
+def strip_jsonc_comments(text: str) -> str:
+    out: List[str] = []
+    start = 0
+    n = len(text)
+    quote = text.find('"')
+    slash = text.find("/")
+    while slash != -1:
+        if quote != -1 and quote < slash:
+            end = quote
+            while True:
+                end = text.find('"', end + 1)
+                if end == -1:
+                    end = n
+                    break
+                k = end - 1
+                while text[k] == "\\":
+                    k -= 1
+                if (end - 1 - k) % 2 == 0:
+                    break
+            i = end + 1
+        else:
+            marker = text[slash + 1 : slash + 2]
+            if marker == "/":
+                out.append(text[start:slash])
+                end = text.find("\n", slash + 2)
+                i = start = n if end == -1 else end
+            elif marker == "*":
+                out.append(text[start:slash])
+                end = text.find("*/", slash + 2)
+                i = start = n if end == -1 else end + 2
+            else:
+                i = slash + 1
+        if quote != -1 and quote < i:
+            quote = text.find('"', i)
+        if slash < i:
+            slash = text.find("/", i)
+    out.append(text[start:])
+    return "".join(out)
+
+
+def json_loads_bytes(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8", errors="ignore"))
+
+
+def iter_jsonl_lines(fh, chunk_size: int = 1 << 20):
+    pending: List[bytes] = []
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        cut = chunk.rfind(b"\n")
+        if cut == -1:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        for line in b"".join(pending).split(b"\n"):
+            line = line.strip()
+            if line:
+                yield line
+        pending = [chunk[cut + 1 :]]
+    tail = b"".join(pending).strip()
+    if tail:
+        yield tail
+
+
+def iter_lines_containing(buf, needle: bytes):
+    pos = 0
+    while True:
+        hit = buf.find(needle, pos)
+        if hit == -1:
+            return
+        start = buf.rfind(b"\n", 0, hit) + 1
+        end = buf.find(b"\n", hit)
+        if end == -1:
+            end = len(buf)
+        yield buf[start:end]
+        pos = end + 1
+
+
+def extract_message_text(contents) -> str:
+    if not isinstance(contents, list):
+        return ""
+    parts: List[str] = []
+    for c in contents:
+        if not isinstance(c, dict):
+            continue
+        ctype = c.get("type")
+        if ctype in _TEXT_CONTENT_TYPES:
+            text = c.get("text", "")
+            if text:
+                parts.append(text)
+        elif ctype and "image" in ctype:
+            parts.append("[image]")
+    return "\n".join(parts).strip()
+
+
+def json_dumps_bytes(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class KeepAliveHttps:
+    def __init__(self, host: str, timeout: float = 6) -> None:
+        self.host = host
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._conn_proxy: Optional[tuple[str, int, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    def _proxy(self) -> Optional[tuple[str, int, Dict[str, str]]]:
+        try:
+            if urllib_request.proxy_bypass(self.host):
+                return None
+            proxy = urllib_request.getproxies().get("https")
+        except Exception:
+            return None
+        if not proxy:
+            return None
+        if "://" not in proxy:
+            proxy = f"http://{proxy}"
+        parsed = urlparse(proxy)
+        if not parsed.hostname:
+            return None
+        tunnel_headers: Dict[str, str] = {}
+        if parsed.username:
+            creds = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+            tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode("utf-8")).decode("ascii")
+        return parsed.hostname, parsed.port or 80, tunnel_headers
+
+    def _connect(self, proxy: Optional[tuple[str, int, Dict[str, str]]]) -> http.client.HTTPSConnection:
+        if proxy is None:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        conn = http.client.HTTPSConnection(proxy[0], proxy[1], timeout=self.timeout)
+        conn.set_tunnel(self.host, headers=proxy[2])
+        return conn
+
+    def _follow_redirect(
+        self,
+        status: int,
+        location: str,
+        method: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        if method == "POST" and status in (301, 302, 303):
+            method, body = "GET", None
+            headers = {k: v for k, v in headers.items() if k.lower() not in ("content-type", "content-length")}
+        req = urllib_request.Request(location, data=body, headers=headers, method=method)
+        try:
+            with urllib_request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.status, resp.headers, resp.read()
+        except urllib_error.HTTPError as exc:
+            return exc.code, exc.headers, exc.read()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        headers = headers or {}
+        with self._lock:
+            proxy = self._proxy()
+            if self._conn is not None and proxy != self._conn_proxy:
+                self._conn.close()
+                self._conn = None
+            while True:
+                conn = self._conn
+                reused = conn is not None
+                if conn is None:
+                    conn = self._connect(proxy)
+                    self._conn = conn
+                    self._conn_proxy = proxy
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    self._conn = None
+                    if reused:
+                        continue
+                    raise
+                break
+        location = resp.headers.get("Location")
+        if resp.status in _REDIRECT_STATUSES and location and (method in ("GET", "HEAD") or resp.status in (301, 302, 303)):
+            return self._follow_redirect(resp.status, urljoin(f"https://{self.host}{path}", location), method, body, headers)
+        return resp.status, resp.headers, data
+
+
+_PROBE_ADAPTER = None
+_PROBE_ADAPTER_LOCK = threading.Lock()
+_PROBE_LOCAL = threading.local()
+
+
+def probe_session():
+    global _PROBE_ADAPTER
+    session = getattr(_PROBE_LOCAL, "session", None)
+    if session is not None:
+        return session
+    with _PROBE_ADAPTER_LOCK:
+        if _PROBE_ADAPTER is None:
+            try:
+                from requests.adapters import HTTPAdapter
+            except Exception:
+                _PROBE_ADAPTER = False
+            else:
+                _PROBE_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        adapter = _PROBE_ADAPTER
+    if not adapter:
+        return None
+    import requests
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    _PROBE_LOCAL.session = session
+    return session
+
+
 def log_diagnosis(title: str, detail: str) -> None:
     try:
         LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -240,7 +630,27 @@ def probe_endpoints(
     if org_id:
         headers["OpenAI-Organization"] = org_id
 
+    use_session = probe_session() is not None
+
+    def send(method: str, url: str, payload: Optional[Dict[str, object]] = None) -> tuple[bool, str]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        try:
+            resp = probe_session().request(method, url, headers=headers, data=data, timeout=timeout)
+        except Exception as exc:
+            return False, str(exc)
+        body = resp.content.decode("utf-8", errors="ignore")
+        if 200 <= resp.status_code < 300:
+            return True, body
+        return False, f"HTTP {resp.status_code}: {body or resp.reason}"
+
+    def post(url: str, payload: Dict[str, object]) -> tuple[bool, str]:
+        if use_session:
+            return send("POST", url, payload)
+        return post_json(url, headers, payload, timeout=timeout)
+
     def get_json(url: str) -> tuple[bool, str]:
+        if use_session:
+            return send("GET", url)
         req = urllib_request.Request(url, headers=headers, method="GET")
         try:
             with urllib_request.urlopen(req, timeout=timeout) as resp:
@@ -275,18 +685,18 @@ def probe_endpoints(
             return get_json(url)
         if endpoint == "/moderations":
             payload = {"model": moderation_model, "input": "hello"}
-            return post_json(url, headers, payload, timeout=timeout)
+            return post(url, payload)
         if endpoint == "/embeddings":
             payload = {"model": embedding_model, "input": "hello"}
-            return post_json(url, headers, payload, timeout=timeout)
+            return post(url, payload)
         if endpoint == "/chat/completions":
             payload = {"model": model, "messages": [{"role": "user", "content": "hello"}]}
-            return post_json(url, headers, payload, timeout=timeout)
+            return post(url, payload)
         if endpoint == "/completions":
             payload = {"model": model, "prompt": "hello"}
-            return post_json(url, headers, payload, timeout=timeout)
+            return post(url, payload)
         payload = {"model": model, "input": "hello"}
-        return post_json(url, headers, payload, timeout=timeout)
+        return post(url, payload)
 
     def parse_json_payload(body: str):
         text = body.strip() if isinstance(body, str) else ""
@@ -497,21 +907,41 @@ def probe_endpoints(
         return result
 
     endpoints = build_candidates()
-    results = []
-    success_endpoint = ""
-    for label, ep, url in endpoints:
+    slots: list[Optional[tuple]] = [None] * len(endpoints)
+    pool = ThreadPoolExecutor(max_workers=8)
+    pending = {}
+    for index, (label, ep, url) in enumerate(endpoints):
         if ep in skip_endpoints:
-            results.append((label, ep, url, None, f"SKIP: {skip_endpoints[ep]}"))
+            slots[index] = (label, ep, url, None, f"SKIP: {skip_endpoints[ep]}")
             continue
-        ok, body = request_endpoint(ep, url)
-        if ok:
-            content_ok, reason = validate_success_body(ep, body)
-            if not content_ok:
-                ok = False
-                body = f"HTTP 200 但响应内容无效：{reason}"
-        results.append((label, ep, url, ok, body))
-        if ok and ep in ("/responses", "/chat/completions", "/completions") and not success_endpoint:
+        pending[pool.submit(request_endpoint, ep, url)] = index
+    try:
+        for future in as_completed(pending, timeout=timeout * 2):
+            index = pending[future]
+            label, ep, url = endpoints[index]
+            try:
+                ok, body = future.result()
+            except Exception as exc:
+                ok, body = False, str(exc)
+            if ok:
+                content_ok, reason = validate_success_body(ep, body)
+                if not content_ok:
+                    ok = False
+                    body = f"HTTP 200 但响应内容无效：{reason}"
+            slots[index] = (label, ep, url, ok, body)
+    except FutureTimeoutError:
+        for index in pending.values():
+            if slots[index] is None:
+                label, ep, url = endpoints[index]
+                slots[index] = (label, ep, url, False, f"请求超时（超过 {timeout * 2}s）")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    results = [row for row in slots if row is not None]
+    success_endpoint = ""
+    for label, ep, _url, ok, _body in results:
+        if ok and ep in ("/responses", "/chat/completions", "/completions"):
             success_endpoint = label
+            break
 
     for _label, ep, _url, ok, body in results:
         if ok and ep in ("/responses", "/chat/completions", "/completions"):
@@ -626,10 +1056,46 @@ class AppState:
         self.codex_path: Optional[str] = None
         self.codex_version: Optional[str] = None
         self.vscode_install_dir: Optional[str] = None
+        self.vscode_cli_support: Dict[tuple[str, float], bool] = {}
         saved_dir = self.store.get("vscode_install_dir")
         if isinstance(saved_dir, str) and saved_dir:
             self.vscode_install_dir = saved_dir
 
+
+def vscode_supports_command(state: AppState, code_cli: str) -> bool:
+    try:
+        mtime = os.path.getmtime(code_cli)
+    except OSError:
+        mtime = 0.0
+    key = (code_cli, mtime)
+    cached = state.vscode_cli_support.get(key)
+    if cached is not None:
+        return cached
+    saved = state.store.get("vscode_cli_probe")
+    if (
+        isinstance(saved, dict)
+        and saved.get("cli") == code_cli
+        and saved.get("mtime") == mtime
+        and isinstance(saved.get("supports_command"), bool)
+    ):
+        state.vscode_cli_support[key] = saved["supports_command"]
+        return saved["supports_command"]
+    try:
+        creationflags = 0x08000000 if os.name == "nt" else 0
+        proc = subprocess.run([code_cli, "--help"], capture_output=True, text=True, timeout=3, creationflags=creationflags)
+    except Exception:
+        return False
+    output = (proc.stdout or "") + (proc.stderr or "")
+    supported = "--command" in output
+    state.vscode_cli_support[key] = supported
+    state.store["vscode_cli_probe"] = {"cli": code_cli, "mtime": mtime, "supports_command": supported}
+    try:
+        save_store(state.store)
+    except Exception:
+        pass
+    return supported
+
+
 class AccountPage(QtWidgets.QWidget):
     def __init__(self, state: AppState, refresh_pages=None) -> None:
         super().__init__()
@@ -828,9 +1294,7 @@ class AccountPage(QtWidgets.QWidget):
             return
         self.type_proxy.setChecked(True)
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
 
     def on_show(self) -> None:
@@ -1139,9 +1603,7 @@ class NetworkDiagnosticsPage(QtWidgets.QWidget):
         self._sync_card_widths()
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def _start_marquee(self, label: QtWidgets.QLabel, base_text: str, key: str) -> None:
         self._stop_marquee(key)
@@ -1458,9 +1920,7 @@ class CodexStatusPage(QtWidgets.QWidget):
 
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         self.refresh_status()
@@ -1864,7 +2324,7 @@ class CodexStatusPage(QtWidgets.QWidget):
             return False, "-", str(exc)
 
     def _extract_semver(self, text: str) -> Optional[str]:
-        match = re.search(r"\d+\.\d+\.\d+", text)
+        match = _SEMVER_RE.search(text)
         return match.group(0) if match else None
 
     def _compare_versions(self, local: Optional[str], latest: Optional[str]) -> str:
@@ -1932,9 +2392,7 @@ class ConfigTomlPage(QtWidgets.QWidget):
         layout.addWidget(self.status_label)
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         self.refresh_content()
@@ -2053,7 +2511,7 @@ class ConfigTomlPage(QtWidgets.QWidget):
         try:
             config_path.parent.mkdir(parents=True, exist_ok=True)
             content = self.editor.toPlainText()
-            config_path.write_text(content, encoding="utf-8")
+            atomic_write_text(config_path, content)
             self.status_label.setText(f"已保存：{config_path}")
         except Exception as exc:
             message_error(self, "失败", str(exc))
@@ -2135,9 +2593,7 @@ class OpencodeConfigPage(QtWidgets.QWidget):
         layout.addWidget(self.status_label)
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         self.refresh_accounts()
@@ -2188,7 +2644,7 @@ class OpencodeConfigPage(QtWidgets.QWidget):
             raw_json = self._safe_json_load(content)
             self._raw_json = raw_json
             if raw_json is not None:
-                masked = self._mask_api_keys(raw_json)
+                masked = self._mask_api_keys(raw_json) if self._contains_api_key(raw_json) else raw_json
                 self.editor.setPlainText(json.dumps(masked, ensure_ascii=False, indent=2))
                 self.status_label.setText("读取完成")
             else:
@@ -2210,7 +2666,7 @@ class OpencodeConfigPage(QtWidgets.QWidget):
                     return str(candidate)
         return shutil.which("opencode")
     def _extract_semver(self, text: str) -> Optional[str]:
-        match = re.search(r"\d+\.\d+\.\d+", text)
+        match = _SEMVER_RE.search(text)
         return match.group(0) if match else None
 
     def _get_opencode_local_version(self, exe: str) -> str:
@@ -2305,6 +2761,19 @@ class OpencodeConfigPage(QtWidgets.QWidget):
             run_in_ui(apply_latest)
 
         threading.Thread(target=worker, daemon=True).start()
+
+    def _contains_api_key(self, obj) -> bool:
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                if "apiKey" in current:
+                    return True
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+        return False
+
     def _mask_api_keys(self, obj):
         if isinstance(obj, dict):
             out = {}
@@ -2384,17 +2853,15 @@ class OpencodeConfigPage(QtWidgets.QWidget):
         entry = provider.get(key)
         if not isinstance(entry, dict):
             entry = {}
-        entry = dict(entry)
+            provider[key] = entry
         entry["name"] = name
         entry.setdefault("npm", "@ai-sdk/openai")
         options = entry.get("options")
         if not isinstance(options, dict):
             options = {}
+            entry["options"] = options
         options["apiKey"] = api_key
         options["baseURL"] = base_url
-        entry["options"] = options
-        provider[key] = entry
-        raw["provider"] = provider
         raw.setdefault("$schema", "https://opencode.ai/config.json")
         return raw
 
@@ -2413,7 +2880,7 @@ class OpencodeConfigPage(QtWidgets.QWidget):
             raw_current = self._raw_json
         raw_updated = self._update_config_with_account(raw_current, self.account_map[idx])
         self._raw_json = raw_updated
-        masked = self._mask_api_keys(raw_updated)
+        masked = self._mask_api_keys(raw_updated) if self._contains_api_key(raw_updated) else raw_updated
         self.editor.setPlainText(json.dumps(masked, ensure_ascii=False, indent=2))
         self.status_label.setText("已应用账号，点击保存写入文件")
 
@@ -2437,8 +2904,9 @@ class OpencodeConfigPage(QtWidgets.QWidget):
             if data is None:
                 message_error(self, "失败", "JSON 解析失败，请检查格式")
                 return
-            data = self._restore_api_keys(data, self._raw_json)
-            config_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            if self._contains_api_key(data):
+                data = self._restore_api_keys(data, self._raw_json)
+            atomic_write_text(config_path, json.dumps(data, ensure_ascii=False, indent=2))
             self.status_label.setText(f"已保存：{config_path}")
         except Exception as exc:
             message_error(self, "失败", str(exc))
@@ -2448,10 +2916,13 @@ class OpencodeConfigPage(QtWidgets.QWidget):
 
 
 class SkillsPage(QtWidgets.QWidget):
+    _SKILL_TEXT_CACHE_LIMIT = 256 * 1024
+
     def __init__(self, state: AppState) -> None:
         super().__init__()
         self.state = state
         self.skill_items: List[Dict[str, object]] = []
+        self._skill_list_keys: List[str] = []
 
         layout = QtWidgets.QVBoxLayout(self)
         header = QtWidgets.QLabel("Skill 管理")
@@ -2535,9 +3006,7 @@ class SkillsPage(QtWidgets.QWidget):
         layout.addWidget(self.status_label)
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         self.refresh_list()
@@ -2556,9 +3025,9 @@ class SkillsPage(QtWidgets.QWidget):
                 stripped = line.strip()
                 if stripped == "---":
                     break
-                if ":" not in stripped:
+                key, sep, value = stripped.partition(":")
+                if not sep:
                     continue
-                key, value = stripped.split(":", 1)
                 key = key.strip().lower()
                 value = value.strip()
                 if key == "name" and value:
@@ -2573,10 +3042,10 @@ class SkillsPage(QtWidgets.QWidget):
                     continue
                 lower = stripped.lower()
                 if not name and lower.startswith("name:"):
-                    name = stripped.split(":", 1)[1].strip()
+                    name = stripped.partition(":")[2].strip()
                     continue
                 if not desc and lower.startswith("description:"):
-                    desc = stripped.split(":", 1)[1].strip()
+                    desc = stripped.partition(":")[2].strip()
                     continue
                 if name and desc:
                     break
@@ -2612,11 +3081,14 @@ class SkillsPage(QtWidgets.QWidget):
         title = path.name
         desc = "无描述"
         has_doc = False
+        raw_text: Optional[str] = None
         if skill_md.exists():
             try:
                 content = skill_md.read_text(encoding="utf-8", errors="ignore")
                 title, desc = self._extract_title_desc(content, path.name)
                 has_doc = True
+                if len(content) <= self._SKILL_TEXT_CACHE_LIMIT:
+                    raw_text = content
             except Exception:
                 has_doc = False
         return {
@@ -2625,6 +3097,7 @@ class SkillsPage(QtWidgets.QWidget):
             "path": path,
             "source": source,
             "has_doc": has_doc,
+            "raw_text": raw_text,
         }
 
     def _find_skill_dirs(self, base: Path) -> List[Path]:
@@ -2637,44 +3110,73 @@ class SkillsPage(QtWidgets.QWidget):
             return results
         return results
 
+    def _sorted_subdirs(self, base: Path, skip: tuple[str, ...] = ()) -> List[Path]:
+        try:
+            with os.scandir(base) as it:
+                entries = [e for e in it if e.name not in skip and e.is_dir()]
+        except OSError:
+            return []
+        entries.sort(key=lambda e: os.path.normcase(e.name))
+        return [Path(e.path) for e in entries]
+
     def refresh_list(self) -> None:
-        self.list_widget.clear()
         self.skill_items = []
         root = self._skills_root()
         if not root.exists():
+            self.list_widget.clear()
+            self._skill_list_keys = []
             self.status_label.setText(f"技能目录不存在：{root}")
             self._reset_detail()
             return
 
         system_dir = root / ".system"
         if system_dir.exists():
-            for entry in sorted(system_dir.iterdir()):
-                if entry.is_dir():
-                    self.skill_items.append(self._build_skill_item(entry, "系统"))
+            for entry in self._sorted_subdirs(system_dir):
+                self.skill_items.append(self._build_skill_item(entry, "系统"))
 
         user_dir = root / "user"
         if user_dir.exists():
             for entry in self._find_skill_dirs(user_dir):
                 self.skill_items.append(self._build_skill_item(entry, "用户"))
 
-        for entry in sorted(root.iterdir()):
-            if entry.is_dir() and entry.name not in (".system", "user"):
-                self.skill_items.append(self._build_skill_item(entry, "本地"))
+        for entry in self._sorted_subdirs(root, skip=(".system", "user")):
+            self.skill_items.append(self._build_skill_item(entry, "本地"))
 
-        for item in self.skill_items:
-            label = f"[{item['source']}] {item['name']}"
-            if item.get("desc"):
-                label = f"{label} - {item['desc']}"
-            list_item = QtWidgets.QListWidgetItem(label)
-            list_item.setData(QtCore.Qt.UserRole, item)
-            self.list_widget.addItem(list_item)
+        self._populate_list()
 
         if not self.skill_items:
             self.status_label.setText("未发现任何技能")
             self._reset_detail()
         else:
             self.status_label.setText(f"共 {len(self.skill_items)} 个技能")
-            self.list_widget.setCurrentRow(0)
+            self.on_select(0)
+
+    def _populate_list(self) -> None:
+        widget = self.list_widget
+        keys = [str(item["path"]) for item in self.skill_items]
+        widget.setUpdatesEnabled(False)
+        widget.blockSignals(True)
+        try:
+            reuse = keys == self._skill_list_keys and widget.count() == len(keys)
+            if not reuse:
+                widget.clear()
+            for row, item in enumerate(self.skill_items):
+                label = f"[{item['source']}] {item['name']}"
+                if item.get("desc"):
+                    label = f"{label} - {item['desc']}"
+                if reuse:
+                    list_item = widget.item(row)
+                    list_item.setText(label)
+                else:
+                    list_item = QtWidgets.QListWidgetItem(label)
+                    widget.addItem(list_item)
+                list_item.setData(QtCore.Qt.UserRole, item)
+            self._skill_list_keys = keys
+            if keys:
+                widget.setCurrentRow(0)
+        finally:
+            widget.blockSignals(False)
+            widget.setUpdatesEnabled(True)
 
     def _reset_detail(self) -> None:
         self.name_label.setText("-")
@@ -2707,7 +3209,10 @@ class SkillsPage(QtWidgets.QWidget):
         self.remove_btn.setEnabled(source != "系统")
 
         readme = ""
-        if isinstance(path, Path):
+        cached = data.get("raw_text")
+        if isinstance(cached, str):
+            readme = cached
+        elif isinstance(path, Path):
             skill_md = path / "SKILL.md"
             if skill_md.exists():
                 try:
@@ -2844,6 +3349,24 @@ class SkillsPage(QtWidgets.QWidget):
 
 
 class VSCodePluginPage(QtWidgets.QWidget):
+    _READONLY_LINEEDIT_QSS = (
+        "QLineEdit {"
+        "border: 1px solid #8ea6ff;"
+        "border-radius: 6px;"
+        "padding: 4px 8px;"
+        "background: #ffffff;"
+        "}"
+        "QLineEdit:read-only {"
+        "background: #f7f9ff;"
+        "}"
+    )
+    _LOOKUP_CACHE_TTL = 60.0
+    _CHANNEL_LABELS = {
+        "stable": "\u7a33\u5b9a\u7248",
+        "preview": "\u9884\u89c8\u7248",
+        "both": "\u7a33\u5b9a/\u9884\u89c8\u5747\u6709",
+    }
+
     def __init__(self, state: AppState) -> None:
         super().__init__()
         self.state = state
@@ -2853,10 +3376,23 @@ class VSCodePluginPage(QtWidgets.QWidget):
         self._backup_dir: Optional[Path] = None
         self._workspace_dir: Optional[Path] = None
         self._vscode_install_dir: Optional[Path] = None
+        self._ext_scan_cache: Dict[Path, tuple[float, List[Path]]] = {}
+        self._cli_cache: Optional[tuple[Optional[str], float]] = None
+        self._exe_cache: Optional[tuple[Optional[str], float]] = None
+        self._marketplace_http = KeepAliveHttps("marketplace.visualstudio.com")
+        self._scan_lock = threading.Lock()
+        self._ext_refresh_token = 0
         if isinstance(self.state.vscode_install_dir, str) and self.state.vscode_install_dir:
             self._vscode_install_dir = Path(self.state.vscode_install_dir)
 
-        layout = QtWidgets.QVBoxLayout(self)
+        self._page_layout = QtWidgets.QVBoxLayout(self)
+        self._built = False
+
+    def _ensure_built(self) -> None:
+        if self._built:
+            return
+        self._built = True
+        layout = self._page_layout
         header = QtWidgets.QLabel("VS Code 插件")
         header.setFont(self._header_font())
         layout.addWidget(header)
@@ -2871,17 +3407,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
         self.vscode_path_edit.setReadOnly(True)
         self.vscode_path_edit.setClearButtonEnabled(False)
         self.vscode_path_edit.setMinimumHeight(32)
-        self.vscode_path_edit.setStyleSheet(
-            "QLineEdit {"
-            "border: 1px solid #8ea6ff;"
-            "border-radius: 6px;"
-            "padding: 4px 8px;"
-            "background: #ffffff;"
-            "}"
-            "QLineEdit:read-only {"
-            "background: #f7f9ff;"
-            "}"
-        )
+        self.vscode_path_edit.setStyleSheet(self._READONLY_LINEEDIT_QSS)
         self.pick_vscode_btn = QtWidgets.QPushButton("选择目录")
         self.pick_vscode_btn.clicked.connect(self.pick_vscode_install_dir)
         vscode_row.addWidget(vscode_caption)
@@ -2895,17 +3421,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
         self.workspace_path_edit.setReadOnly(True)
         self.workspace_path_edit.setClearButtonEnabled(False)
         self.workspace_path_edit.setMinimumHeight(32)
-        self.workspace_path_edit.setStyleSheet(
-            "QLineEdit {"
-            "border: 1px solid #8ea6ff;"
-            "border-radius: 6px;"
-            "padding: 4px 8px;"
-            "background: #ffffff;"
-            "}"
-            "QLineEdit:read-only {"
-            "background: #f7f9ff;"
-            "}"
-        )
+        self.workspace_path_edit.setStyleSheet(self._READONLY_LINEEDIT_QSS)
         self.pick_workspace_btn = QtWidgets.QPushButton("选择工作区")
         self.pick_workspace_btn.clicked.connect(self.pick_workspace)
         workspace_row.addWidget(workspace_caption)
@@ -2927,7 +3443,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
 
         action_row = QtWidgets.QHBoxLayout()
         self.scan_btn = QtWidgets.QPushButton("扫描插件")
-        self.scan_btn.clicked.connect(self.refresh_extensions)
+        self.scan_btn.clicked.connect(lambda: self.refresh_extensions(force=True))
         self.pick_index_btn = QtWidgets.QPushButton("选择 index 文件")
         self.pick_index_btn.clicked.connect(self.pick_index_file)
         self.open_ext_btn = QtWidgets.QPushButton("打开插件目录")
@@ -2999,11 +3515,10 @@ class VSCodePluginPage(QtWidgets.QWidget):
         layout.addStretch(1)
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
+        self._ensure_built()
         self._refresh_vscode_install_label()
         self._refresh_workspace_label()
         self.refresh_extensions()
@@ -3035,19 +3550,18 @@ class VSCodePluginPage(QtWidgets.QWidget):
             message_warn(self, "提示", "未在所选目录找到 Code.exe 或 Code - Insiders.exe，请选择包含 Code.exe 的安装目录")
             return
         self._vscode_install_dir = path
+        self._cli_cache = None
+        self._exe_cache = None
         self.state.vscode_install_dir = str(path)
         self.state.store["vscode_install_dir"] = str(path)
         save_store(self.state.store)
         self._refresh_vscode_install_label()
 
     def _find_vscode_exe_in_dir(self, root: Path) -> Optional[str]:
-        candidates = [
-            root / "Code.exe",
-            root / "Code - Insiders.exe",
-        ]
-        for candidate in candidates:
-            if candidate.is_file():
-                return str(candidate)
+        for exe_name in ("Code.exe", "Code - Insiders.exe"):
+            candidate = os.path.join(root, exe_name)
+            if os.path.isfile(candidate):
+                return candidate
         return None
 
     def pick_workspace(self) -> None:
@@ -3076,7 +3590,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
             return
         code_cli = self._find_vscode_cli()
         args = None
-        if code_cli and self._vscode_supports_command(code_cli):
+        if code_cli and vscode_supports_command(self.state, code_cli):
             args = [code_cli, "-r", str(workspace), "--command", "chatgpt.openSidebar"]
         else:
             if code_cli:
@@ -3117,82 +3631,68 @@ class VSCodePluginPage(QtWidgets.QWidget):
             "ServiceHub.Host.Node.x64.exe",
             "ServiceHub.TestWindowStoreHost.exe",
         ]
+        args = ["taskkill", "/F", "/T"]
         for name in targets:
-            try:
-                subprocess.run(["taskkill", "/F", "/T", "/IM", name], capture_output=True, text=True)
-            except Exception:
-                continue
+            args.extend(("/IM", name))
+        try:
+            subprocess.run(
+                args,
+                capture_output=True,
+                text=True,
+                creationflags=0x08000000 if os.name == "nt" else 0,
+            )
+        except Exception:
+            return
 
     def _clear_vscode_cache(self, install_dir: Optional[Path] = None) -> None:
         appdata = os.environ.get("APPDATA")
         local = os.environ.get("LOCALAPPDATA")
-        paths = []
+        join = os.path.join
+        paths: List[str] = []
         channel = None
         portable_user_data = None
         if install_dir:
-            if (install_dir / "Code - Insiders.exe").is_file():
+            install = str(install_dir)
+            if os.path.isfile(join(install, "Code - Insiders.exe")):
                 channel = "insiders"
-            elif (install_dir / "Code.exe").is_file():
+            elif os.path.isfile(join(install, "Code.exe")):
                 channel = "stable"
-            portable_root = install_dir / "data" / "user-data"
-            if portable_root.is_dir():
+            portable_root = join(install, "data", "user-data")
+            if os.path.isdir(portable_root):
                 portable_user_data = portable_root
         if portable_user_data:
-            base = portable_user_data
-            paths += [
-                base / "WebView",
-                base / "CachedData",
-                base / "Cache",
-                base / "GPUCache",
-                base / "Local Storage",
-                base / "Service Worker" / "CacheStorage",
-                base / "Service Worker" / "ScriptCache",
-                base / "User" / "workspaceStorage",
-                base / "User" / "globalStorage",
-            ]
+            paths += [join(portable_user_data, *sub) for sub in _VSCODE_APPDATA_SUBS + _VSCODE_LOCAL_SUBS]
         else:
-            if channel == "stable":
-                names = ["Code"]
-            elif channel == "insiders":
-                names = ["Code - Insiders"]
-            else:
-                names = ["Code", "Code - Insiders"]
+            names = _VSCODE_CHANNEL_NAMES[channel]
             if appdata:
-                base = Path(appdata)
                 for name in names:
-                    root = base / name
-                    paths += [
-                        root / "WebView",
-                        root / "CachedData",
-                        root / "Cache",
-                        root / "GPUCache",
-                        root / "Local Storage",
-                        root / "Service Worker" / "CacheStorage",
-                        root / "Service Worker" / "ScriptCache",
-                    ]
+                    root = join(appdata, name)
+                    if os.path.isdir(root):
+                        paths += [join(root, *sub) for sub in _VSCODE_APPDATA_SUBS]
             if local:
-                base = Path(local) / "Microsoft"
-                if channel == "stable":
-                    local_names = ["Code"]
-                elif channel == "insiders":
-                    local_names = ["Code - Insiders"]
-                else:
-                    local_names = ["Code", "Code - Insiders"]
-                for name in local_names:
-                    root = base / name
-                    paths += [
-                        root / "User" / "workspaceStorage",
-                        root / "User" / "globalStorage",
-                    ]
-                paths.append(Path(local) / "Temp" / "Code")
-        for p in paths:
+                for name in names:
+                    root = join(local, "Microsoft", name)
+                    if os.path.isdir(root):
+                        paths += [join(root, *sub) for sub in _VSCODE_LOCAL_SUBS]
+                paths.append(join(local, "Temp", "Code"))
+        def remove(p: str) -> None:
+            try:
+                st = os.lstat(p)
+            except OSError:
+                return
             try:
-                if p.is_dir():
+                if stat.S_ISDIR(st.st_mode):
                     shutil.rmtree(p, ignore_errors=True)
-                elif p.exists():
-                    p.unlink(missing_ok=True)
+                else:
+                    os.unlink(p)
             except Exception:
-                continue
+                return
+
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+            list(pool.map(remove, paths))
 
     def _ensure_open_on_startup(self, workspace: Path) -> bool:
         settings_path = workspace / ".vscode" / "settings.json"
@@ -3200,51 +3700,58 @@ class VSCodePluginPage(QtWidgets.QWidget):
             settings_path.parent.mkdir(parents=True, exist_ok=True)
             raw = settings_path.read_text(encoding="utf-8", errors="ignore") if settings_path.exists() else ""
             data = self._load_jsonc(raw)
+            if data.get("chatgpt.openOnStartup") is True:
+                return True
             data["chatgpt.openOnStartup"] = True
-            settings_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            atomic_write_text(settings_path, json.dumps(data, ensure_ascii=False, indent=2))
             return True
         except Exception:
             return False
 
     def _find_vscode_cli(self) -> Optional[str]:
+        now = time.monotonic()
+        if self._cli_cache and now - self._cli_cache[1] < self._LOOKUP_CACHE_TTL:
+            return self._cli_cache[0]
+        found = None
         for name in ("code", "code.cmd", "code.exe", "code-insiders", "code-insiders.cmd"):
             path = shutil.which(name)
             if path:
-                return path
-        return None
+                found = path
+                break
+        self._cli_cache = (found, now)
+        return found
 
     def _find_vscode_exe(self) -> Optional[str]:
+        now = time.monotonic()
+        if self._exe_cache and now - self._exe_cache[1] < self._LOOKUP_CACHE_TTL:
+            return self._exe_cache[0]
+        found = self._locate_vscode_exe()
+        self._exe_cache = (found, now)
+        return found
+
+    def _locate_vscode_exe(self) -> Optional[str]:
         if self._vscode_install_dir and self._vscode_install_dir.exists():
             exe = self._find_vscode_exe_in_dir(self._vscode_install_dir)
             if exe:
                 return exe
-        candidates = []
+        bases: List[str] = []
         local = os.environ.get("LOCALAPPDATA")
         program = os.environ.get("ProgramFiles") or os.environ.get("PROGRAMFILES")
         program_x86 = os.environ.get("ProgramFiles(x86)") or os.environ.get("PROGRAMFILES(X86)")
         if local:
-            candidates.append(Path(local) / "Programs" / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(local) / "Programs" / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
+            bases.append(os.path.join(local, "Programs"))
         if program:
-            candidates.append(Path(program) / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(program) / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
+            bases.append(program)
         if program_x86:
-            candidates.append(Path(program_x86) / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(program_x86) / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
-        for candidate in candidates:
-            if candidate.is_file():
-                return str(candidate)
+            bases.append(program_x86)
+        installs = (("Microsoft VS Code", "Code.exe"), ("Microsoft VS Code Insiders", "Code - Insiders.exe"))
+        for base in bases:
+            for folder, exe_name in installs:
+                candidate = os.path.join(base, folder, exe_name)
+                if os.path.isfile(candidate):
+                    return candidate
         return None
 
-    def _vscode_supports_command(self, code_cli: str) -> bool:
-        try:
-            creationflags = 0x08000000 if os.name == "nt" else 0
-            proc = subprocess.run([code_cli, "--help"], capture_output=True, text=True, timeout=3, creationflags=creationflags)
-        except Exception:
-            return False
-        output = (proc.stdout or "") + (proc.stderr or "")
-        return "--command" in output
-
     def _extension_roots(self) -> List[Path]:
         homes: List[Path] = []
         home = Path.home()
@@ -3283,23 +3790,33 @@ class VSCodePluginPage(QtWidgets.QWidget):
             if key in seen:
                 continue
             seen.add(key)
-            if root.exists() and root.is_dir():
+            if os.path.isdir(root):
                 uniq.append(root)
         return uniq
 
-    def _find_extensions(self) -> List[Path]:
+    def _find_extensions(self, force: bool = False) -> List[Path]:
         results: List[Path] = []
         for root in self._extension_roots():
             try:
-                entries = list(root.iterdir())
-            except Exception:
+                mtime = os.stat(root).st_mtime
+            except OSError:
+                self._ext_scan_cache.pop(root, None)
                 continue
-            for entry in entries:
-                if not entry.is_dir():
-                    continue
-                name = entry.name.lower()
-                if name.startswith("openai.chatgpt"):
-                    results.append(entry)
+            cached = self._ext_scan_cache.get(root)
+            if not force and cached and cached[0] == mtime:
+                results.extend(cached[1])
+                continue
+            found: List[Path] = []
+            try:
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if entry.name.lower().startswith("openai.chatgpt") and entry.is_dir():
+                            found.append(Path(entry.path))
+            except OSError:
+                self._ext_scan_cache.pop(root, None)
+                continue
+            self._ext_scan_cache[root] = (mtime, found)
+            results.extend(found)
         uniq: List[Path] = []
         seen: set[str] = set()
         for item in results:
@@ -3335,7 +3852,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
         text = str(raw_version or "").strip()
         if not text:
             return "", ""
-        match = re.search(r"\d+\.\d+\.\d+", text)
+        match = _SEMVER_RE.search(text)
         if not match:
             return "", ""
         semver = match.group(0)
@@ -3345,36 +3862,34 @@ class VSCodePluginPage(QtWidgets.QWidget):
             platform = tail[1:].strip().lower()
         return semver, platform
 
-    def _is_prerelease_version(self, item: object) -> bool:
-        if not isinstance(item, dict):
-            return False
-        flags_text = str(item.get("flags", "")).lower()
-        if "prerelease" in flags_text:
-            return True
-        for prop in (item.get("properties") or []):
-            if not isinstance(prop, dict):
-                continue
-            if prop.get("key") == "Microsoft.VisualStudio.Code.PreRelease":
-                return str(prop.get("value", "")).strip().lower() == "true"
-        return False
-
-    def _marketplace_target_platform(self, item: object) -> str:
-        if not isinstance(item, dict):
-            return ""
+    def _marketplace_version_info(self, item: Dict[str, object]) -> tuple[bool, str]:
+        is_prerelease: Optional[bool] = True if "prerelease" in str(item.get("flags", "")).lower() else None
+        platform = ""
         value = item.get("targetPlatform")
         if isinstance(value, str) and value.strip():
-            return value.strip().lower()
-        for prop in (item.get("properties") or []):
+            platform = value.strip().lower()
+        for prop in (item.get("properties") or ()):
+            if is_prerelease is not None and platform:
+                break
             if not isinstance(prop, dict):
                 continue
-            if prop.get("key") == "Microsoft.VisualStudio.Code.TargetPlatform":
-                prop_val = str(prop.get("value", "")).strip().lower()
-                if prop_val:
-                    return prop_val
-        return ""
+            key = prop.get("key")
+            if key == "Microsoft.VisualStudio.Code.PreRelease":
+                if is_prerelease is None:
+                    is_prerelease = str(prop.get("value", "")).strip().lower() == "true"
+            elif key == "Microsoft.VisualStudio.Code.TargetPlatform":
+                if not platform:
+                    platform = str(prop.get("value", "")).strip().lower()
+        return bool(is_prerelease), platform
+
+    def _marketplace_post(self, path: str, data: bytes, headers: Dict[str, str]) -> bytes:
+        status, _, body = self._marketplace_http.request("POST", path, body=data, headers=headers)
+        if not 200 <= status < 300:
+            raise RuntimeError(f"HTTP {status}")
+        return body
 
     def _fetch_marketplace_release_meta(self) -> Optional[Dict[str, object]]:
-        url = "https://marketplace.visualstudio.com/_apis/public/gallery/extensionquery"
+        path = "/_apis/public/gallery/extensionquery"
         payload = {
             "filters": [
                 {
@@ -3387,14 +3902,14 @@ class VSCodePluginPage(QtWidgets.QWidget):
             "flags": 0x1 | 0x2 | 0x10 | 0x80 | 0x10000,
         }
         data = json.dumps(payload).encode("utf-8")
-        req = urllib_request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json")
-        req.add_header("Accept", "application/json;api-version=7.1-preview.1")
-        req.add_header("User-Agent", "CodexSwitcher")
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json;api-version=7.1-preview.1",
+            "User-Agent": "CodexSwitcher",
+        }
         try:
-            with urllib_request.urlopen(req, timeout=6) as resp:
-                body = resp.read().decode("utf-8", errors="ignore")
-            obj = json.loads(body)
+            body = self._marketplace_post(path, data, headers)
+            obj = json_loads_bytes(body)
             ext = obj["results"][0]["extensions"][0]
             versions = ext.get("versions", [])
             if not isinstance(versions, list) or not versions:
@@ -3410,8 +3925,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
                 version = str(item.get("version", "")).strip()
                 if not version:
                     continue
-                is_prerelease = self._is_prerelease_version(item)
-                platform = self._marketplace_target_platform(item)
+                is_prerelease, platform = self._marketplace_version_info(item)
                 channel = "preview" if is_prerelease else "stable"
                 if is_prerelease and latest_prerelease is None:
                     latest_prerelease = version
@@ -3427,6 +3941,10 @@ class VSCodePluginPage(QtWidgets.QWidget):
 
             if not latest_stable and not latest_prerelease:
                 return None
+            if latest_stable:
+                channel_map.setdefault(f"{latest_stable}|", "stable")
+            if latest_prerelease:
+                channel_map.setdefault(f"{latest_prerelease}|", "preview")
             return {
                 "latest_stable": latest_stable,
                 "latest_prerelease": latest_prerelease,
@@ -3455,28 +3973,59 @@ class VSCodePluginPage(QtWidgets.QWidget):
         if not semver:
             return ""
         channel_map = meta.get("channel_map")
-        channel = None
-        if isinstance(channel_map, dict):
-            channel = channel_map.get(f"{semver}|{platform}") or channel_map.get(f"{semver}|")
-        if channel is None:
-            if semver == str(meta.get("latest_stable") or ""):
-                channel = "stable"
-            elif semver == str(meta.get("latest_prerelease") or ""):
-                channel = "preview"
-        if channel == "stable":
-            return "\u7a33\u5b9a\u7248"
-        if channel == "preview":
-            return "\u9884\u89c8\u7248"
-        if channel == "both":
-            return "\u7a33\u5b9a/\u9884\u89c8\u5747\u6709"
-        return ""
+        if not isinstance(channel_map, dict):
+            return ""
+        channel = channel_map.get(f"{semver}|{platform}") or channel_map.get(f"{semver}|")
+        return self._CHANNEL_LABELS.get(channel, "")
+
+    def _version_key(self, version: str) -> tuple[int, ...]:
+        return tuple(int(m.group()) for _, m in zip(range(3), _DIGITS_RE.finditer(version)))
+
+    def _extension_sort_key(self, item: Dict[str, object]) -> tuple[tuple[int, ...], float]:
+        version = item.get("version_key")
+        if not isinstance(version, tuple):
+            version = self._version_key(str(item.get("version", "")))
+        path = item.get("path")
+        mtime = 0.0
+        if isinstance(path, Path):
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = 0.0
+        return version, mtime
+
+    def refresh_extensions(self, force: bool = False) -> None:
+        self._ext_refresh_token += 1
+        token = self._ext_refresh_token
+        self.scan_btn.setEnabled(False)
+        self.status_label.setText("扫描中...")
+
+        def runner() -> None:
+            with self._scan_lock:
+                meta = self._fetch_marketplace_release_meta()
+                items: List[Dict[str, object]] = []
+                try:
+                    for path in self._find_extensions(force=force):
+                        version = self._parse_extension_version(path)
+                        items.append({"path": path, "version": version, "version_key": self._version_key(version)})
+                    items.sort(key=self._extension_sort_key, reverse=True)
+                except Exception as exc:
+                    log_exception(exc)
+
+            def done() -> None:
+                if self._ext_refresh_token != token:
+                    return
+                self.scan_btn.setEnabled(True)
+                self._apply_extension_scan(meta, items)
+
+            run_in_ui(done)
+
+        threading.Thread(target=runner, daemon=True).start()
 
-    def refresh_extensions(self) -> None:
+    def _apply_extension_scan(self, meta: Optional[Dict[str, object]], items: List[Dict[str, object]]) -> None:
+        self._marketplace_meta = meta
+        self.extension_items = items
         self.ext_combo.clear()
-        self.extension_items = []
-        self._marketplace_meta = self._fetch_marketplace_release_meta()
-        for path in self._find_extensions():
-            self.extension_items.append({"path": path, "version": self._parse_extension_version(path)})
         if self._marketplace_meta:
             latest_text = self._format_marketplace_latest_text(self._marketplace_meta)
             self.ext_latest_label.setText(latest_text)
@@ -3488,13 +4037,6 @@ class VSCodePluginPage(QtWidgets.QWidget):
             self.ext_latest_label.setText("\u83b7\u53d6\u5931\u8d25")
             self.ext_latest_label.setToolTip("")
 
-        self.extension_items.sort(
-            key=lambda item: (
-                tuple(int(x) for x in re.findall(r"\d+", str(item.get("version", "")))[:3]),
-                (item.get("path").stat().st_mtime if isinstance(item.get("path"), Path) and item.get("path").exists() else 0),
-            ),
-            reverse=True,
-        )
         if not self.extension_items:
             self.ext_combo.addItem("未发现 openai.chatgpt 扩展")
             self.ext_path_label.setText("-")
@@ -3600,33 +4142,21 @@ class VSCodePluginPage(QtWidgets.QWidget):
             message_error(self, "失败", str(exc))
 
     def _split_model_input(self, raw: str) -> List[str]:
-        token_re = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._:-]{1,120}$")
-        normalized = (raw or "").replace("，", ",").replace("；", ";")
-        parts = [p.strip() for p in re.split(r"[,;|\s]+", normalized) if p.strip()]
-        models: List[str] = []
-        seen: set[str] = set()
+        normalized = (raw or "").translate(_MODEL_NORMALIZE_TABLE)
+        parts = [p.strip() for p in _MODEL_SPLIT_RE.split(normalized) if p.strip()]
+        models: Dict[str, str] = {}
         for part in parts:
-            if not token_re.match(part):
-                continue
-            key = part.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            models.append(part)
-        return models
+            if _MODEL_TOKEN_RE.match(part):
+                models.setdefault(part.lower(), part)
+        return list(models.values())
 
     def _target_models(self) -> List[str]:
         defaults = ["gpt-5.3-codex", "gpt-5.2-codex", "gpt-5.2"]
         user_models = self._split_model_input(self.model_edit.text().strip())
-        merged: List[str] = []
-        seen: set[str] = set()
+        merged: Dict[str, str] = {}
         for model in user_models + defaults:
-            key = model.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            merged.append(model)
-        return merged
+            merged.setdefault(model.lower(), model)
+        return list(merged.values())
 
     def _reasoning_efforts_literal(self) -> str:
         return (
@@ -3639,22 +4169,27 @@ class VSCodePluginPage(QtWidgets.QWidget):
 
     def _merge_models_into_js_array(self, body: str, models: List[str]) -> tuple[str, bool]:
         quote = '"' if '"' in body else "'"
-        existing = re.findall(r'["\']([^"\']+)["\']', body)
-        merged: List[str] = []
-        seen: set[str] = set()
+        existing = _JS_STRING_RE.findall(body)
+        ordered: Dict[str, str] = {}
         for model in models + existing:
-            key = model.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            merged.append(model)
-        new_body = ",".join(f"{quote}{item}{quote}" for item in merged)
+            ordered.setdefault(model.lower(), model)
+        new_body = ",".join(f"{quote}{item}{quote}" for item in ordered.values())
         changed = new_body != body
         return new_body, changed
 
+    def _parse_js_string_list(self, body: str) -> tuple[List[str], set[str]]:
+        existing = _JS_STRING_RE.findall(body)
+        return existing, {m.lower() for m in existing}
+
     def _apply_allowlist_patch(self, content: str, models: List[str]) -> tuple[str, bool]:
-        set_pattern = re.compile(r'([A-Za-z_$][\w$]*)=new Set\(\[(.*?)\]\)', re.S)
         touched = False
+        parsed: Dict[str, tuple[List[str], set[str]]] = {}
+
+        def parse(body: str) -> tuple[List[str], set[str]]:
+            hit = parsed.get(body)
+            if hit is None:
+                hit = parsed[body] = self._parse_js_string_list(body)
+            return hit
 
         def repl(match: re.Match[str]) -> str:
             nonlocal touched
@@ -3666,17 +4201,15 @@ class VSCodePluginPage(QtWidgets.QWidget):
                 return match.group(0)
 
             body = match.group(2)
-            existing = re.findall(r'["\']([^"\']+)["\']', body)
-            gpt_like_count = sum(1 for m in existing if m.startswith("gpt-"))
+            existing, existing_lower = parse(body)
             if not (
-                "gpt-5.2-codex" in existing
-                or "gpt-5.1-codex-mini" in existing
-                or gpt_like_count >= 3
+                "gpt-5.2-codex" in existing_lower
+                or "gpt-5.1-codex-mini" in existing_lower
+                or sum(1 for m in existing if m.startswith("gpt-")) >= 3
             ):
                 return match.group(0)
 
             touched = True
-            existing_lower = {m.lower() for m in existing}
             missing = [m for m in models if m.lower() not in existing_lower]
             if not missing:
                 return match.group(0)
@@ -3686,18 +4219,16 @@ class VSCodePluginPage(QtWidgets.QWidget):
             new_body = f"{prefix},{body}" if body.strip() else prefix
             return f"{match.group(1)}=new Set([{new_body}])"
 
-        updated = set_pattern.sub(repl, content)
+        updated = _JS_SET_RE.sub(repl, content)
         if touched:
             return updated, True
 
         # Fallback for builds that still expose SUe only.
         if "SUe=new Set" in content:
-            pattern = re.compile(r"SUe=new Set\(\[(.*?)\]\)")
-            match = pattern.search(content)
+            match = _SUE_SET_RE.search(content)
             if match:
                 body = match.group(1)
-                existing = re.findall(r'["\']([^"\']+)["\']', body)
-                existing_lower = {m.lower() for m in existing}
+                _, existing_lower = parse(body)
                 missing = [m for m in models if m.lower() not in existing_lower]
                 if not missing:
                     return content, True
@@ -3707,11 +4238,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
                 return content[: match.start(1)] + new_body + content[match.end(1) :], True
 
         # Fallback for the newer max flow (MODEL_ORDER_BY_AUTH_METHOD).
-        model_order_pattern = re.compile(
-            r'(MODEL_ORDER_BY_AUTH_METHOD\s*=\s*\{.*?apikey\s*:\s*\[)(.*?)(\])',
-            re.S,
-        )
-        model_order_match = model_order_pattern.search(content)
+        model_order_match = _MODEL_ORDER_RE.search(content)
         if model_order_match:
             body = model_order_match.group(2)
             new_body, changed = self._merge_models_into_js_array(body, models)
@@ -3726,14 +4253,13 @@ class VSCodePluginPage(QtWidgets.QWidget):
         if "CHAT_GPT_AUTH_ONLY_MODELS" not in content:
             return content, False
 
-        pattern = re.compile(r'CHAT_GPT_AUTH_ONLY_MODELS\s*=\s*new Set\(\[(.*?)\]\)', re.S)
-        match = pattern.search(content)
+        match = _AUTH_ONLY_SET_RE.search(content)
         if not match:
             return content, False
 
         body = match.group(1)
         quote = '"' if '"' in body else "'"
-        existing = re.findall(r'["\']([^"\']+)["\']', body)
+        existing = _JS_STRING_RE.findall(body)
         deny_set = {m.lower() for m in models}
         filtered = [item for item in existing if item.lower() not in deny_set]
 
@@ -3750,16 +4276,13 @@ class VSCodePluginPage(QtWidgets.QWidget):
         if marker not in content:
             return content, False
 
-        already_pattern = re.compile(
-            r'[A-Za-z_$][\w$]*!=="apikey"\s*&&\s*!!mt\s*&&\s*CHAT_GPT_AUTH_ONLY_MODELS\.has\(normalizeModel\(mt\)\)'
-        )
-        if already_pattern.search(content):
+        if '!=="apikey"' in content and _AUTH_GUARD_ALREADY_RE.search(content):
             return content, True
 
         idx = content.find(marker)
         window = content[max(0, idx - 800) : idx]
         auth_var = ""
-        for found in re.finditer(r'([A-Za-z_$][\w$]*)===\"(?:chatgpt|apikey)\"', window):
+        for found in _AUTH_VAR_RE.finditer(window):
             auth_var = found.group(1)
 
         if not auth_var:
@@ -3770,8 +4293,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
         if tight_src in content:
             return content.replace(tight_src, tight_dst, 1), True
 
-        spaced = re.compile(r'&&\s*!!mt\s*&&\s*CHAT_GPT_AUTH_ONLY_MODELS\.has\(normalizeModel\(mt\)\)')
-        matched = spaced.search(content)
+        matched = _AUTH_GUARD_SPACED_RE.search(content) if "!!mt" in content else None
         if not matched:
             return content, False
 
@@ -3792,10 +4314,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
                 patched = patched.replace(src, dst, 1)
                 gate_ok = True
             else:
-                pattern = re.compile(
-                    r'i==="chatgpt"\?!0:\(i==="copilot"\?([A-Za-z_$][\w$]*):([A-Za-z_$][\w$]*)\)\.has\(v\.model\)'
-                )
-                match = pattern.search(patched)
+                match = _APIKEY_GATE_RE.search(patched) if '(i==="copilot"?' in patched else None
                 if match:
                     replacement = (
                         f'i==="chatgpt"||i==="apikey"?!0:(i==="copilot"?{match.group(1)}:{match.group(2)}).has(v.model)'
@@ -3813,16 +4332,10 @@ class VSCodePluginPage(QtWidgets.QWidget):
     def _is_apikey_dynamic_model_flow(self, content: str) -> bool:
         if "listModels" not in content or "modelsByType" not in content:
             return False
-        gate_pattern = re.compile(
-            r'i===\"chatgpt\"\s*\|\|\s*i===\"apikey\"\s*\?!0:\(i===\"copilot\"\?[A-Za-z_$][\w$]*:[A-Za-z_$][\w$]*\)\.has\(v\.model\)'
-        )
-        return gate_pattern.search(content) is not None
+        return _DYNAMIC_FLOW_GATE_RE.search(content) is not None
 
     def _apply_dynamic_apikey_models_patch(self, content: str, models: List[str]) -> tuple[str, bool]:
-        gate_pattern = re.compile(
-            r'([A-Za-z_$][\w$]*)===\"chatgpt\"\|\|\1===\"apikey\"\?!0:\(\1===\"copilot\"\?[A-Za-z_$][\w$]*:[A-Za-z_$][\w$]*\)\.has\(([A-Za-z_$][\w$]*)\.model\)'
-        )
-        gate_match = gate_pattern.search(content)
+        gate_match = _DYNAMIC_GATE_RE.search(content) if '==="copilot"?' in content else None
         if not gate_match:
             return content, False
 
@@ -3831,7 +4344,7 @@ class VSCodePluginPage(QtWidgets.QWidget):
         window_end = min(len(content), gate_match.end() + 1800)
         window = content[window_start:window_end]
 
-        models_var_match = re.search(r',([A-Za-z_$][\w$]*)=\{models:\[\]\};', window)
+        models_var_match = _MODELS_VAR_RE.search(window)
         if not models_var_match:
             return content, False
         models_var = models_var_match.group(1)
@@ -3851,29 +4364,20 @@ class VSCodePluginPage(QtWidgets.QWidget):
             if list_end == -1:
                 return content, False
             body = content[list_start:list_end]
-            existing = re.findall(r'["\']([^"\']+)["\']', body)
-            merged: List[str] = []
-            seen: set[str] = set()
+            existing = _JS_STRING_RE.findall(body)
+            ordered: Dict[str, str] = {}
             for model in models + existing:
-                key = model.lower()
-                if key in seen:
-                    continue
-                seen.add(key)
-                merged.append(model)
+                ordered.setdefault(model.lower(), model)
             quote = '"' if '"' in body else "'"
-            new_body = ",".join(f"{quote}{item}{quote}" for item in merged)
+            new_body = ",".join(f"{quote}{item}{quote}" for item in ordered.values())
             if new_body == body:
                 return content, True
             return content[:list_start] + new_body + content[list_end:], True
 
-        merged_models: List[str] = []
-        seen_models: set[str] = set()
+        unique_models: Dict[str, str] = {}
         for model in models:
-            key = model.lower()
-            if key in seen_models:
-                continue
-            seen_models.add(key)
-            merged_models.append(model)
+            unique_models.setdefault(model.lower(), model)
+        merged_models = list(unique_models.values())
 
         if not merged_models:
             return content, True
@@ -3888,12 +4392,11 @@ class VSCodePluginPage(QtWidgets.QWidget):
         return content[:insert_at] + injection + content[insert_at:], True
 
 
-    def _apply_apikey_order_inject_patch(self, content: str, models: List[str]) -> tuple[str, bool]:
-        prefix = re.compile(
-            r'i==="apikey"&&\(\(\)=>\{const Y=\[(.*?)\],X=new Map\(Y\.map\(\(A,R\)=>\[A,R\]\)\);',
-            re.S,
-        )
-        match = prefix.search(content)
+    def _apply_apikey_order_inject_patch(self, content: str, models: List[str], start: int = 0) -> tuple[str, bool]:
+        match = None
+        anchor_pos = content.find(_ORDER_INJECT_ANCHOR, start)
+        if anchor_pos != -1:
+            match = _ORDER_INJECT_PREFIX_RE.search(content, anchor_pos)
         if not match:
             if self._is_apikey_dynamic_model_flow(content):
                 return self._apply_dynamic_apikey_models_patch(content, models)
@@ -3901,71 +4404,82 @@ class VSCodePluginPage(QtWidgets.QWidget):
 
         body = match.group(1)
         quote = '"' if '"' in body else "'"
-        existing_y = re.findall(r'["\']([^"\']+)["\']', body)
-        y_merged: List[str] = []
-        seen: set[str] = set()
+        existing_y = _JS_STRING_RE.findall(body)
+        ordered: Dict[str, str] = {}
         for model in models + existing_y:
-            key = model.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            y_merged.append(model)
+            ordered.setdefault(model.lower(), model)
+        y_merged = list(ordered.values())
         new_y_body = ",".join(f"{quote}{m}{quote}" for m in y_merged)
+        edits: List[tuple[int, int, str]] = []
         if new_y_body != body:
-            content = content[: match.start(1)] + new_y_body + content[match.end(1) :]
-            match = prefix.search(content)
-            if not match:
-                return content, False
+            edits.append((match.start(1), match.end(1), new_y_body))
 
         block_start = match.start()
-        block_end = content.find('})()', block_start)
+        body_end = match.end(1)
+        block_end = content.find('})()', body_end)
         if block_end == -1:
-            block_end = min(len(content), block_start + 5000)
-        sort_idx = content.find('m.models.sort(', block_start, block_end)
+            block_end = min(len(content), block_start + 5000 - len(new_y_body) + len(body))
+        sort_idx = content.find('m.models.sort(', body_end, block_end)
         if sort_idx == -1:
-            sort_idx = content.find('m.models.sort(', block_start)
+            sort_idx = content.find('m.models.sort(', body_end)
         if sort_idx == -1:
+            content = _splice_edits(content, edits)
             if self._is_apikey_dynamic_model_flow(content):
                 return self._apply_dynamic_apikey_models_patch(content, models)
             return content, False
 
         efforts = self._reasoning_efforts_literal()
-        block_segment = content[block_start:block_end]
-        injections: List[str] = []
-        for model in models:
-            marker = f'm.models.find(A=>A.model==="{model}")||m.models.unshift({{'
-            if marker in block_segment:
-                continue
-            injections.append(
-                f'm.models.find(A=>A.model==="{model}")||m.models.unshift({{model:"{model}",supportedReasoningEfforts:{efforts},defaultReasoningEffort:"medium"}}),'
-            )
+        present = set(_ORDER_INJECTED_RE.findall(content, body_end, block_end))
+        injections = [
+            f'm.models.find(A=>A.model==="{model}")||m.models.unshift({{model:"{model}",supportedReasoningEfforts:{efforts},defaultReasoningEffort:"medium"}}),'
+            for model in models
+            if model not in present
+        ]
 
         if injections:
-            content = content[:sort_idx] + "".join(injections) + content[sort_idx:]
-        return content, True
+            edits.append((sort_idx, sort_idx, "".join(injections)))
+        return _splice_edits(content, edits), True
 
-    def _apply_initial_data_patch(self, content: str, models: List[str]) -> tuple[str, bool]:
-        if 'initialData:i==="apikey"?{data:[' not in content:
+    def _apply_initial_data_patch(self, content: str, models: List[str], start: int = 0) -> tuple[str, bool]:
+        anchor_pos = content.find(_INITIAL_DATA_ANCHOR, start)
+        if anchor_pos == -1:
             if self._is_apikey_dynamic_model_flow(content):
                 return content, True
             return content, False
 
         efforts = self._reasoning_efforts_literal()
-        data_entries = [
-            f'{{model:"{model}",supportedReasoningEfforts:{efforts},defaultReasoningEffort:"medium",isDefault:!1}}'
-            for model in models
-        ]
-        desired = 'initialData:i==="apikey"?{data:[' + ",".join(data_entries) + ']}:void 0'
-        if desired in content:
+        head = '{model:"'
+        tail = f'",supportedReasoningEfforts:{efforts},defaultReasoningEffort:"medium",isDefault:!1}}'
+        data_entries = [head + model + tail for model in models]
+        desired = _INITIAL_DATA_ANCHOR + ",".join(data_entries) + _INITIAL_DATA_END
+        if content.find(desired, anchor_pos) != -1:
             return content, True
 
-        pattern = re.compile(r'initialData:i===\"apikey\"\?\{data:\[(.*?)\]\}:void 0', re.S)
-        match = pattern.search(content)
-        if not match:
+        end = content.find(_INITIAL_DATA_END, anchor_pos + len(_INITIAL_DATA_ANCHOR))
+        if end == -1:
             if self._is_apikey_dynamic_model_flow(content):
                 return content, True
             return content, False
-        return content[: match.start()] + desired + content[match.end() :], True
+        end += len(_INITIAL_DATA_END)
+        return content[:anchor_pos] + desired + content[end:], True
+
+    def _locate_patch_anchors(self, content: str) -> Dict[str, int]:
+        anchors: Dict[str, int] = {}
+        for name, literal in _PATCH_ANCHORS:
+            pos = content.find(literal)
+            if pos != -1:
+                anchors[name] = pos
+        return anchors
+
+    def _anchor_hint(self, content: str, original: str, offset: Optional[int], literal: str) -> int:
+        if offset is None:
+            return 0
+        if content.startswith(literal, offset):
+            return offset
+        shifted = offset + len(content) - len(original)
+        if shifted >= 0 and content.startswith(literal, shifted):
+            return shifted
+        return 0
 
     def apply_patch(self) -> None:
         if not self._index_path or not self._index_path.exists():
@@ -3977,17 +4491,54 @@ class VSCodePluginPage(QtWidgets.QWidget):
             message_warn(self, "提示", "请输入至少一个模型名称（可用逗号分隔）")
             return
 
-        try:
-            original = self._index_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception as exc:
-            message_error(self, "失败", str(exc))
-            return
+        index_path = self._index_path
+        self.apply_btn.setEnabled(False)
 
-        content, ok1 = self._apply_allowlist_patch(original, target_models)
-        content, ok2 = self._apply_apikey_filter_patch(content, target_models)
-        content, ok3 = self._apply_apikey_order_inject_patch(content, target_models)
-        content, ok4 = self._apply_initial_data_patch(content, target_models)
+        def worker() -> None:
+            try:
+                original = index_path.read_bytes().decode("utf-8", errors="surrogateescape")
+                result = self._compute_patch(original, target_models)
+                error = None
+            except Exception as exc:
+                original, result, error = "", None, exc
 
+            def done() -> None:
+                self.apply_btn.setEnabled(True)
+                if result is None:
+                    message_error(self, "失败", str(error))
+                    return
+                self._finalize_patch(index_path, original, target_models, *result)
+
+            run_in_ui(done)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _compute_patch(self, original: str, target_models: List[str]) -> tuple[str, bool, bool, bool, bool]:
+        anchors = self._locate_patch_anchors(original)
+        dynamic_flow = "list_models" in anchors and "models_by_type" in anchors
+        content, ok1 = self._apply_allowlist_patch(original, target_models)
+        ok2 = ok3 = ok4 = False
+        if "gate" in anchors or "auth_only" in anchors:
+            content, ok2 = self._apply_apikey_filter_patch(content, target_models)
+        if "order" in anchors or dynamic_flow:
+            start = self._anchor_hint(content, original, anchors.get("order"), _ORDER_INJECT_ANCHOR)
+            content, ok3 = self._apply_apikey_order_inject_patch(content, target_models, start)
+        if "initial" in anchors or dynamic_flow:
+            start = self._anchor_hint(content, original, anchors.get("initial"), _INITIAL_DATA_ANCHOR)
+            content, ok4 = self._apply_initial_data_patch(content, target_models, start)
+        return content, ok1, ok2, ok3, ok4
+
+    def _finalize_patch(
+        self,
+        index_path: Path,
+        original: str,
+        target_models: List[str],
+        content: str,
+        ok1: bool,
+        ok2: bool,
+        ok3: bool,
+        ok4: bool,
+    ) -> None:
         critical_failed = []
         if not ok1:
             critical_failed.append("allowlist/model-order")
@@ -4005,9 +4556,16 @@ class VSCodePluginPage(QtWidgets.QWidget):
             )
             return
 
-        backup_path = self._backup_index(self._index_path)
+        preview = ", ".join(target_models[:5])
+        if len(target_models) > 5:
+            preview += ", ..."
+        if content == original:
+            self.status_label.setText(f"规则已是最新，index 文件未改动；模型：{preview}")
+            return
+
         try:
-            self._index_path.write_text(content, encoding="utf-8")
+            backup_path = self._backup_index(index_path)
+            index_path.write_bytes(content.encode("utf-8", errors="surrogateescape"))
         except Exception as exc:
             message_error(self, "失败", str(exc))
             return
@@ -4028,9 +4586,6 @@ class VSCodePluginPage(QtWidgets.QWidget):
                 + "可重启 VS Code 后验证模型下拉；若仍缺失可改用手动 index 文件。",
             )
 
-        preview = ", ".join(target_models[:5])
-        if len(target_models) > 5:
-            preview += ", ..."
         if optional_failed:
             self.status_label.setText(f"模型已增加（部分规则未更新），备份：{backup_path}；模型：{preview}")
         else:
@@ -4050,13 +4605,35 @@ class VSCodePluginPage(QtWidgets.QWidget):
         return [p for p in candidates if p.exists()]
 
     def _load_jsonc(self, text: str) -> dict:
-        no_block = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
-        no_line = re.sub(r"//.*", "", no_block)
+        try:
+            data = json.loads(text)
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            pass
+        no_line = strip_jsonc_comments(text)
         try:
             return json.loads(no_line) if no_line.strip() else {}
         except Exception:
             return {}
 
+    def _disable_update_flags_in_text(self, text: str) -> Optional[str]:
+        missing: List[str] = []
+        for key, pattern in _SETTINGS_UPDATE_FLAG_RES:
+            text, count = pattern.subn(r"\g<1>false", text, count=1)
+            if not count:
+                missing.append(key)
+        if missing:
+            brace = text.find("{")
+            if brace == -1 or text[brace + 1 :].lstrip().startswith("}"):
+                return None
+            insertion = "".join(f'\n  "{key}": false,' for key in missing)
+            text = text[: brace + 1] + insertion + text[brace + 1 :]
+        data = self._load_jsonc(text)
+        if not isinstance(data, dict) or any(data.get(key) is not False for key, _ in _SETTINGS_UPDATE_FLAG_RES):
+            return None
+        return text
+
     def disable_auto_update(self) -> None:
         paths = self._settings_paths()
         if not paths:
@@ -4065,12 +4642,27 @@ class VSCodePluginPage(QtWidgets.QWidget):
         updated = 0
         for path in paths:
             try:
-                raw = path.read_text(encoding="utf-8", errors="ignore")
+                raw = path.read_bytes()
             except Exception:
-                raw = ""
-            data = self._load_jsonc(raw)
-            data["extensions.autoUpdate"] = False
-            data["extensions.autoCheckUpdates"] = False
+                raw = b""
+            text = raw.decode("utf-8", errors="surrogateescape")
+            patched = self._disable_update_flags_in_text(text)
+            if patched is not None:
+                try:
+                    if patched != text:
+                        path.write_text(patched, encoding="utf-8", errors="surrogateescape")
+                    updated += 1
+                except Exception:
+                    pass
+                continue
+            try:
+                data = json_loads_bytes(raw)
+            except Exception:
+                data = None
+            if not isinstance(data, dict):
+                data = self._load_jsonc(raw.decode("utf-8", errors="ignore"))
+            for key, _ in _SETTINGS_UPDATE_FLAG_RES:
+                data[key] = False
             try:
                 path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
                 updated += 1
@@ -4082,13 +4674,19 @@ class VSCodePluginPage(QtWidgets.QWidget):
             message_warn(self, "提示", "无法写入设置文件")
 
 
-class SettingsPage(QtWidgets.QWidget):
+_QR_CANDIDATES_CACHE: Optional[List[Path]] = None
 
 
+class SettingsPage(QtWidgets.QWidget):
+    _QR_PATH_CACHE: Optional[Path] = None
+
     def __init__(self, state: AppState, on_update_count_changed: Optional[Callable[[int], None]] = None) -> None:
         super().__init__()
         self.state = state
         self._on_update_count_changed = on_update_count_changed
+        self._github_http = KeepAliveHttps("api.github.com")
+        self._github_etags: Dict[str, tuple[str, object]] = {}
+        self._latest_release_item: Optional[Dict[str, object]] = None
 
         layout = QtWidgets.QVBoxLayout(self)
         header = QtWidgets.QLabel("检查更新")
@@ -4152,6 +4750,9 @@ class SettingsPage(QtWidgets.QWidget):
         self._checking = False
 
     def _developer_qr_candidates(self) -> List[Path]:
+        global _QR_CANDIDATES_CACHE
+        if _QR_CANDIDATES_CACHE is not None:
+            return _QR_CANDIDATES_CACHE
         roots: List[Path] = []
 
         def add_root(raw: Optional[Path]) -> None:
@@ -4161,7 +4762,7 @@ class SettingsPage(QtWidgets.QWidget):
                 resolved = raw.resolve()
             except Exception:
                 resolved = raw
-            key = str(resolved).lower()
+            key = os.path.normcase(str(resolved))
             if key not in seen_roots:
                 seen_roots.add(key)
                 roots.append(resolved)
@@ -4207,22 +4808,28 @@ class SettingsPage(QtWidgets.QWidget):
         for root in roots:
             for name in names:
                 candidate = root / name
-                key = str(candidate).lower()
+                key = os.path.normcase(str(candidate))
                 if key in seen_paths:
                     continue
                 seen_paths.add(key)
                 paths.append(candidate)
+        _QR_CANDIDATES_CACHE = paths
         return paths
 
     def _load_developer_qr(self) -> None:
         target = max(120, min(self.dev_qr_image.width(), self.dev_qr_image.height()) - 20)
-        candidates = self._developer_qr_candidates()
+        cached = SettingsPage._QR_PATH_CACHE
+        candidates = [cached] if cached is not None else []
+        candidates.extend(self._developer_qr_candidates())
         for path in candidates:
             if not path.exists():
                 continue
             pixmap = QtGui.QPixmap(str(path))
             if pixmap.isNull():
+                if path == cached:
+                    SettingsPage._QR_PATH_CACHE = None
                 continue
+            SettingsPage._QR_PATH_CACHE = path
             scaled = pixmap.scaled(
                 target,
                 target,
@@ -4241,9 +4848,7 @@ class SettingsPage(QtWidgets.QWidget):
         self.dev_qr_hint.setVisible(True)
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         if not self._checked_once:
@@ -4312,9 +4917,6 @@ class SettingsPage(QtWidgets.QWidget):
         latest_sem = self._extract_semver(latest or "")
         if not local_sem or not latest_sem:
             return 0
-        release_count = self._count_releases_behind(local_sem, latest_sem)
-        if release_count > 0:
-            return release_count
         try:
             local_parts = [int(p) for p in local_sem.split(".")]
             latest_parts = [int(p) for p in latest_sem.split(".")]
@@ -4326,16 +4928,36 @@ class SettingsPage(QtWidgets.QWidget):
             latest_parts.append(0)
         if tuple(latest_parts) <= tuple(local_parts):
             return 0
+        if latest_parts[:2] == local_parts[:2]:
+            return latest_parts[2] - local_parts[2]
+        release_count = self._count_releases_behind(local_sem, latest_sem)
+        if release_count > 0:
+            return release_count
         return max(1, latest_parts[2] - local_parts[2])
 
+    def _github_get_json(self, path: str):
+        headers = {"User-Agent": "CodexSwitcher", "Accept": "application/vnd.github+json"}
+        cached = self._github_etags.get(path)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        status, resp_headers, body = self._github_http.request("GET", path, headers=headers)
+        if status == 304 and cached:
+            return cached[1]
+        if not 200 <= status < 300:
+            raise urllib_error.HTTPError(
+                f"https://api.github.com{path}", status, http.client.responses.get(status, ""), resp_headers, None
+            )
+        data = json_loads_bytes(body)
+        etag = resp_headers.get("ETag")
+        if etag:
+            self._github_etags[path] = (etag, data)
+        return data
+
     def _count_releases_behind(self, local_sem: str, latest_sem: str) -> int:
         if local_sem == latest_sem:
             return 0
-        api_url = f"https://api.github.com/repos/{APP_REPO}/releases?per_page=100"
-        req = urllib_request.Request(api_url, headers={"User-Agent": "CodexSwitcher"})
         try:
-            with urllib_request.urlopen(req, timeout=6) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
+            data = self._github_get_json(f"/repos/{APP_REPO}/releases?per_page=100")
         except Exception:
             return 0
         if not isinstance(data, list):
@@ -4362,52 +4984,54 @@ class SettingsPage(QtWidgets.QWidget):
         return 1
 
     def _filter_release_sections(self, body: str) -> str:
-        wanted = {"标题", "变更"}
-        lines = body.splitlines()
-        out: list[str] = []
-        keep = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("##"):
-                heading = stripped.lstrip("#").strip()
-                normalized = heading.replace("：", ":").strip()
-                keep = False
-                for w in wanted:
-                    if normalized == w or normalized.startswith(f"{w}:") or normalized.startswith(f"{w} "):
-                        keep = True
-                        out.append(f"## {w}")
-                        break
-                continue
-            if keep:
-                out.append(line.rstrip())
-        cleaned: list[str] = []
-        blank = False
-        for line in out:
-            if not line.strip():
-                if not blank:
-                    cleaned.append("")
-                blank = True
-            else:
-                cleaned.append(line)
-                blank = False
-        while cleaned and not cleaned[0].strip():
-            cleaned.pop(0)
-        while cleaned and not cleaned[-1].strip():
-            cleaned.pop()
-        return "\n".join(cleaned).strip()
+        wanted = ("标题", "变更")
+        out: List[str] = []
+        for section in _RELEASE_HEADING_SPLIT_RE.split(body)[1:]:
+            head, _, rest = section.partition("\n")
+            normalized = head.strip().lstrip("#").strip().replace("：", ":").strip()
+            for w in wanted:
+                if normalized == w or normalized.startswith(f"{w}:") or normalized.startswith(f"{w} "):
+                    out.append(f"## {w}")
+                    out.extend(line.rstrip() for line in rest.splitlines())
+                    break
+        return _BLANK_RUN_RE.sub("\n\n", "\n".join(out)).strip()
 
     def _get_release_notes(self, local_ver: str, latest_ver: str) -> str:
         latest_sem = self._extract_semver(latest_ver) or latest_ver
         if not latest_sem:
             return "无法解析版本号，无法生成更新内容。"
 
-        api_url = f"https://api.github.com/repos/{APP_REPO}/releases?per_page=20"
-        req = urllib_request.Request(api_url, headers={"User-Agent": "CodexSwitcher"})
-        with urllib_request.urlopen(req, timeout=6) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-        if not isinstance(data, list) or not data:
+        target = self._find_release_by_version(latest_sem, latest_ver)
+        if target is None:
+            target = self._list_release_by_version(latest_sem, latest_ver)
+        if target is None:
             return "无法获取更新内容。"
 
+        body = target.get("body") or ""
+        filtered = self._filter_release_sections(body)
+        if not filtered:
+            return "未找到Release中的标题/变更内容。"
+        return filtered
+
+    def _find_release_by_version(self, latest_sem: str, latest_ver: str) -> Optional[Dict[str, object]]:
+        item = self._latest_release_item
+        if isinstance(item, dict):
+            tag = str(item.get("tag_name") or "")
+            if (self._extract_semver(tag) or tag) in (latest_sem, latest_ver):
+                return item
+        try:
+            item = self._github_get_json(f"/repos/{APP_REPO}/releases/tags/v{urlquote(latest_sem)}")
+        except urllib_error.HTTPError as exc:
+            if exc.code == 404:
+                return None
+            raise
+        return item if isinstance(item, dict) else None
+
+    def _list_release_by_version(self, latest_sem: str, latest_ver: str) -> Optional[Dict[str, object]]:
+        data = self._github_get_json(f"/repos/{APP_REPO}/releases?per_page=20")
+        if not isinstance(data, list) or not data:
+            return None
+
         target = None
         for item in data:
             if not isinstance(item, dict):
@@ -4423,30 +5047,23 @@ class SettingsPage(QtWidgets.QWidget):
                 break
         if target is None:
             target = data[0]
-
-        body = target.get("body") or ""
-        filtered = self._filter_release_sections(body)
-        if not filtered:
-            return "未找到Release中的标题/变更内容。"
-        return filtered
+        return target if isinstance(target, dict) else None
 
     def _get_latest_release(self) -> tuple[bool, str, str, str]:
         try:
-            api_url = f"https://api.github.com/repos/{APP_REPO}/releases/latest"
-            req = urllib_request.Request(api_url, headers={"User-Agent": "CodexSwitcher"})
-            with urllib_request.urlopen(req, timeout=6) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
+            data = self._github_get_json(f"/repos/{APP_REPO}/releases/latest")
+            self._latest_release_item = data if isinstance(data, dict) else None
             tag = data.get("tag_name") or data.get("name") or "未知"
             url = data.get("html_url") or f"https://github.com/{APP_REPO}/releases/latest"
             ver = self._extract_semver(tag) or tag
             return True, ver, url, ""
-        except urllib_error.URLError:
+        except (urllib_error.URLError, http.client.HTTPException, OSError):
             return False, "-", "", "网络不可用或无法访问 GitHub，请检查网络/代理后重试。"
         except Exception as exc:
             return False, "-", "", str(exc)
 
     def _extract_semver(self, text: str) -> Optional[str]:
-        match = re.search(r"\d+\.\d+\.\d+", text)
+        match = _SEMVER_RE.search(text)
         return match.group(0) if match else None
 
     def _compare_versions(self, local: Optional[str], latest: Optional[str]) -> tuple[str, bool]:
@@ -4472,14 +5089,31 @@ class SettingsPage(QtWidgets.QWidget):
 
 
 class SessionManagerPage(QtWidgets.QWidget):
+    _SESSION_TEXT_CACHE_SIZE = 200
+    _DETAIL_PAGE_SIZE = 500
+    _MMAP_MIN_SIZE = 64 * 1024
+
     def __init__(self, state: AppState) -> None:
         super().__init__()
         self.state = state
         self._sessions: list[dict] = []
         self._history_index: dict[str, str] = {}
+        self._search_blobs: list[str] = []
+        self._meta_cache: Optional[dict] = None
+        self._history_state: Optional[dict] = None
+        self._session_text_cache: OrderedDict[str, tuple[float, list[tuple[str, str]]]] = OrderedDict()
+        self._session_text_lock = threading.Lock()
+        self._detail_blocks = None
+        self._keyword_cache: Optional[tuple[tuple[str, int], tuple[list[str], str]]] = None
+        self._terms_pattern_cache: Optional[tuple[tuple[str, ...], re.Pattern[str]]] = None
         self._loaded_once = False
+        self.exporting = False
         self._search_cancel = threading.Event()
         self._active_search_id = 0
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._apply_filter_now)
 
         layout = QtWidgets.QVBoxLayout(self)
         header = QtWidgets.QLabel("Codex会话管理")
@@ -4615,6 +5249,10 @@ class SessionManagerPage(QtWidgets.QWidget):
         export_row.addWidget(self.export_json_btn)
         export_row.addWidget(self.export_md_btn)
         export_row.addStretch(1)
+        self.detail_more_btn = QtWidgets.QPushButton("显示更多")
+        self.detail_more_btn.setVisible(False)
+        self.detail_more_btn.clicked.connect(self._append_detail_blocks)
+        export_row.addWidget(self.detail_more_btn)
         right_layout.addLayout(export_row)
 
         content_layout.addWidget(right, 0)
@@ -4647,9 +5285,7 @@ class SessionManagerPage(QtWidgets.QWidget):
         self._update_clean_mode()
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
         super().resizeEvent(event)
@@ -4697,49 +5333,106 @@ class SessionManagerPage(QtWidgets.QWidget):
     def refresh_index(self) -> None:
         self.refresh_btn.setEnabled(False)
         self.list_widget.clear()
+        self._reset_detail_paging()
         self.detail_text.setPlainText("正在加载会话索引...")
 
         def runner() -> None:
             sessions = self._load_sessions()
             history = self._load_history_index()
+            blobs = [history.get(item.get("id", ""), "") for item in sessions]
 
             def done() -> None:
                 self._sessions = sessions
                 self._history_index = history
+                self._search_blobs = blobs
                 self.refresh_btn.setEnabled(True)
-                self.apply_filter()
+                self._apply_filter_now()
 
             run_in_ui(done)
 
-        threading.Thread(target=runner, daemon=True).start()
+        run_in_pool(runner)
 
     def _load_sessions(self) -> list[dict]:
         base = Path.home() / ".codex" / "sessions"
         if not base.exists():
             return []
-        items = []
-        for path in base.rglob("*.jsonl"):
-            meta = self._read_session_meta(path)
-            if not meta:
-                continue
-            meta["path"] = str(path)
-            meta["size"] = path.stat().st_size
-            meta["mtime"] = path.stat().st_mtime
-            items.append(meta)
+        entries = self._scan_jsonl_entries(str(base))
+        if not entries:
+            return []
+        cache = self._meta_cache if self._meta_cache is not None else self._load_meta_cache()
+        fresh: dict[str, list] = {}
+        with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 4)) as pool:
+            metas = pool.map(lambda entry: self._read_session_meta_entry(entry, cache, fresh), entries)
+            items = [meta for meta in metas if meta]
+        self._meta_cache = fresh
+        if fresh != cache:
+            self._save_meta_cache(fresh)
         items.sort(key=lambda x: x.get("ts_epoch", 0), reverse=True)
         return items
 
-    def _read_session_meta(self, path: Path) -> Optional[dict]:
+    def _read_session_meta_entry(self, entry: os.DirEntry, cache: dict, fresh: dict) -> Optional[dict]:
         try:
-            with path.open("r", encoding="utf-8", errors="ignore") as fh:
-                for _ in range(50):
-                    line = fh.readline()
-                    if not line:
+            st = entry.stat()
+        except OSError:
+            return None
+        cached = cache.get(entry.path)
+        if isinstance(cached, list) and len(cached) == 3 and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            header = cached[2]
+        else:
+            header = self._read_session_meta(entry.path)
+        fresh[entry.path] = [st.st_mtime, st.st_size, header]
+        if not isinstance(header, dict):
+            return None
+        meta = dict(header)
+        meta["path"] = entry.path
+        meta["size"] = st.st_size
+        meta["mtime"] = st.st_mtime
+        return meta
+
+    def _meta_cache_path(self) -> Path:
+        return Path.home() / ".codex" / ".switcher_cache.json"
+
+    def _load_meta_cache(self) -> dict:
+        try:
+            data = json_loads_bytes(self._meta_cache_path().read_bytes())
+        except Exception:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_meta_cache(self, cache: dict) -> None:
+        try:
+            atomic_write_bytes(self._meta_cache_path(), json_dumps_bytes(cache))
+        except Exception as exc:
+            log_exception(exc)
+
+    def _scan_jsonl_entries(self, root: str) -> list[os.DirEntry]:
+        found: list[os.DirEntry] = []
+        pending = [root]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.name.endswith(".jsonl") and entry.is_file():
+                                found.append(entry)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
+    def _read_session_meta(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, "rb") as fh:
+                for idx, line in enumerate(fh):
+                    if idx >= 50:
                         break
-                    line = line.strip()
-                    if not line:
+                    if b'"session_meta"' not in line:
                         continue
-                    data = json.loads(line)
+                    data = json_loads_bytes(line.strip())
                     if data.get("type") != "session_meta":
                         continue
                     payload = data.get("payload") or {}
@@ -4766,6 +5459,16 @@ class SessionManagerPage(QtWidgets.QWidget):
     def _format_time(self, ts: str) -> tuple[str, float]:
         if not ts:
             return ("-", 0.0)
+        if len(ts) >= 20 and ts[-1] == "Z" and ts[10] == "T" and ts[19] in ".Z":
+            try:
+                epoch = calendar.timegm(
+                    (int(ts[0:4]), int(ts[5:7]), int(ts[8:10]), int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), 0, 0, 0)
+                )
+                if len(ts) > 20:
+                    epoch += float(ts[19:-1])
+                return (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch)), float(epoch))
+            except (ValueError, OverflowError, OSError):
+                pass
         try:
             ts_norm = ts.replace("Z", "+00:00")
             dt = datetime.fromisoformat(ts_norm)
@@ -4774,41 +5477,94 @@ class SessionManagerPage(QtWidgets.QWidget):
         except Exception:
             return (ts, 0.0)
 
+    def _history_cache_path(self) -> Path:
+        return Path.home() / ".codex" / ".switcher_history_cache.json"
+
+    def _load_history_state(self) -> dict:
+        try:
+            data = json_loads_bytes(self._history_cache_path().read_bytes())
+        except Exception:
+            return {}
+        return data if isinstance(data, dict) else {}
+
     def _load_history_index(self) -> dict[str, str]:
         history = Path.home() / ".codex" / "history.jsonl"
-        if not history.exists():
+        try:
+            st = history.stat()
+        except OSError:
             return {}
+        state = self._history_state if self._history_state is not None else self._load_history_state()
         index: dict[str, str] = {}
+        offset = 0
+        size_seen = state.get("size_seen")
+        if (
+            state.get("inode") == st.st_ino
+            and isinstance(size_seen, int)
+            and size_seen <= st.st_size
+            and isinstance(state.get("index"), dict)
+        ):
+            index = dict(state["index"])
+            offset = size_seen
+        if offset == st.st_size:
+            self._history_state = state
+            return index
         try:
-            with history.open("r", encoding="utf-8", errors="ignore") as fh:
+            with history.open("rb", buffering=262144) as fh:
+                fh.seek(offset)
                 for line in fh:
-                    line = line.strip()
-                    if not line:
+                    if not line.endswith(b"\n"):
+                        break
+                    if b'"session_id"' not in line:
+                        offset += len(line)
                         continue
-                    data = json.loads(line)
+                    data = json_loads_bytes(line.strip())
+                    offset += len(line)
                     sid = data.get("session_id") or ""
                     text = data.get("text") or ""
                     if not sid:
                         continue
                     prev = index.get(sid, "")
-                    if len(prev) < 2000:
-                        merged = (prev + "\n" + text).strip()
-                        index[sid] = merged[:2000].lower()
+                    if len(prev) >= 2000:
+                        continue
+                    if prev:
+                        merged = (prev + "\n" + text[: 1999 - len(prev)]).rstrip()
+                    else:
+                        merged = text[:2000].strip()
+                    index[sid] = merged.lower()
         except Exception:
-            return index
+            pass
+        self._history_state = {"inode": st.st_ino, "size_seen": offset, "index": index}
+        try:
+            atomic_write_bytes(self._history_cache_path(), json_dumps_bytes(self._history_state))
+        except Exception as exc:
+            log_exception(exc)
         return index
 
     def _parse_keywords(self, raw: str) -> tuple[list[str], str]:
+        key = (raw, self.search_mode.currentIndex())
+        cached = self._keyword_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
         raw = raw.strip().lower()
         if not raw:
             return [], "OR"
         force_or = "|" in raw
-        terms = [t for t in re.split(r"[\s|]+", raw) if t]
-        mode = "AND" if self.search_mode.currentIndex() == 1 else "OR"
+        terms = list(dict.fromkeys(t for t in _KEYWORD_SPLIT_RE.split(raw) if t))
+        mode = "AND" if key[1] == 1 else "OR"
         if force_or:
             mode = "OR"
+        self._keyword_cache = (key, (terms, mode))
         return terms, mode
 
+    def _terms_pattern(self, terms: list[str]) -> re.Pattern[str]:
+        key = tuple(terms)
+        cached = self._terms_pattern_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        pattern = re.compile("|".join(map(re.escape, terms)))
+        self._terms_pattern_cache = (key, pattern)
+        return pattern
+
     def _match_text(self, text: str, terms: list[str], mode: str) -> bool:
         if not terms:
             return True
@@ -4819,14 +5575,23 @@ class SessionManagerPage(QtWidgets.QWidget):
         return any(t in text for t in terms)
 
     def _apply_list(self, items: list[dict], show_empty: bool = True) -> None:
-        self.list_widget.clear()
-        shown = 0
-        for item in items:
-            display = f"{item.get('time_display', '-')} | {item.get('model', '-') or '-'} | {item.get('branch', '-') or '-'} | {item.get('cwd', '-') or '-'}"
-            row = QtWidgets.QListWidgetItem(display)
-            row.setData(QtCore.Qt.UserRole, item)
-            self.list_widget.addItem(row)
-            shown += 1
+        displays = [
+            f"{item.get('time_display', '-')} | {item.get('model', '-') or '-'} | {item.get('branch', '-') or '-'} | {item.get('cwd', '-') or '-'}"
+            for item in items
+        ]
+        self._reset_detail_paging()
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.blockSignals(True)
+        try:
+            self.list_widget.clear()
+            for item, display in zip(items, displays):
+                row = QtWidgets.QListWidgetItem(display)
+                row.setData(QtCore.Qt.UserRole, item)
+                self.list_widget.addItem(row)
+        finally:
+            self.list_widget.blockSignals(False)
+            self.list_widget.setUpdatesEnabled(True)
+        shown = len(items)
         self.count_label.setText(f"共 {shown} 条<b>【ⓘ 提示：鼠标右键Codex CLI/VS Code继续该会话、管理会话。】</b>")
         if shown == 0 and show_empty:
             self.detail_text.setPlainText("无匹配会话。")
@@ -4869,45 +5634,73 @@ class SessionManagerPage(QtWidgets.QWidget):
                 break
         return candidates
 
-    def _session_contains_terms(self, path: str, terms: list[str], mode: str) -> bool:
+    def _extract_session_messages(self, path: str) -> list[tuple[str, str]]:
+        st = os.stat(path)
+        mtime = st.st_mtime
+        with self._session_text_lock:
+            cached = self._session_text_cache.get(path)
+            if cached and cached[0] == mtime:
+                self._session_text_cache.move_to_end(path)
+                return cached[1]
+        with open(path, "rb") as fh:
+            if st.st_size > self._MMAP_MIN_SIZE:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    lines = list(iter_lines_containing(buf, b'"response_item"'))
+            else:
+                lines = list(iter_lines_containing(fh.read(), b'"response_item"'))
+        messages: list[tuple[str, str]] = []
+        for line in lines:
+            if b'"message"' not in line:
+                continue
+            data = json_loads_bytes(line.strip())
+            if data.get("type") != "response_item":
+                continue
+            payload = data.get("payload") or {}
+            if payload.get("type") != "message":
+                continue
+            msg = extract_message_text(payload.get("content"))
+            if msg:
+                messages.append((payload.get("role") or "", msg))
+        with self._session_text_lock:
+            self._session_text_cache[path] = (mtime, messages)
+            self._session_text_cache.move_to_end(path)
+            while len(self._session_text_cache) > self._SESSION_TEXT_CACHE_SIZE:
+                self._session_text_cache.popitem(last=False)
+        return messages
+
+    def _build_term_automaton(self, terms: list[str]):
+        if ahocorasick is None or not terms:
+            return None
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+
+    def _session_contains_terms(self, path: str, terms: list[str], mode: str, automaton=None) -> bool:
         found = set()
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    if data.get("type") != "response_item":
-                        continue
-                    payload = data.get("payload") or {}
-                    if payload.get("type") != "message":
-                        continue
-                    contents = payload.get("content") or []
-                    text_parts = []
-                    if isinstance(contents, list):
-                        for c in contents:
-                            if not isinstance(c, dict):
-                                continue
-                            ctype = c.get("type")
-                            if ctype in ("input_text", "output_text", "text"):
-                                text_parts.append(c.get("text", ""))
-                            elif ctype and "image" in ctype:
-                                text_parts.append("[image]")
-                    msg = "\n".join([p for p in text_parts if p]).strip().lower()
-                    if not msg:
-                        continue
-                    if mode == "OR":
-                        if any(t in msg for t in terms):
-                            return True
-                    else:
-                        for term in terms:
-                            if term in msg:
-                                found.add(term)
-                        if len(found) == len(terms):
-                            return True
+            messages = self._extract_session_messages(path)
         except Exception:
             return False
+        for _, text in messages:
+            msg = text.lower()
+            if automaton is not None:
+                for _, term in automaton.iter(msg):
+                    if mode == "OR":
+                        return True
+                    found.add(term)
+                    if len(found) == len(terms):
+                        return True
+            elif mode == "OR":
+                if any(t in msg for t in terms):
+                    return True
+            else:
+                for term in terms:
+                    if term in msg:
+                        found.add(term)
+                if len(found) == len(terms):
+                    return True
         return False
 
     def _start_deep_search(self, terms: list[str], mode: str, search_id: int) -> None:
@@ -4922,16 +5715,27 @@ class SessionManagerPage(QtWidgets.QWidget):
         self._show_search_progress(total)
         self.search_status.setText(f"history 无匹配，开始深度搜索（可能耗时），范围 {total} 条...")
 
+        automaton = self._build_term_automaton(terms)
+
         def runner() -> None:
-            matches = []
-            for idx, item in enumerate(candidates, 1):
-                if self._search_cancel.is_set() or search_id != self._active_search_id:
-                    break
-                path = item.get("path", "")
-                if path and self._session_contains_terms(path, terms, mode):
-                    matches.append(item)
-                if idx == total or idx % 3 == 0:
-                    run_in_ui(lambda i=idx, t=total, sid=search_id: self._update_search_progress(i, t, sid))
+            hits: list[tuple[int, dict]] = []
+            pool = ThreadPoolExecutor(max_workers=8)
+            futures = {
+                pool.submit(self._session_contains_terms, item.get("path", ""), terms, mode, automaton): (pos, item)
+                for pos, item in enumerate(candidates)
+            }
+            try:
+                for idx, future in enumerate(as_completed(futures), 1):
+                    if self._search_cancel.is_set() or search_id != self._active_search_id:
+                        break
+                    if future.result():
+                        hits.append(futures[future])
+                    if idx == total or idx % 3 == 0:
+                        run_in_ui(lambda i=idx, t=total, sid=search_id: self._update_search_progress(i, t, sid))
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+            hits.sort(key=lambda hit: hit[0])
+            matches = [item for _, item in hits]
             canceled = self._search_cancel.is_set() or search_id != self._active_search_id
 
             def done() -> None:
@@ -4955,9 +5759,13 @@ class SessionManagerPage(QtWidgets.QWidget):
 
             run_in_ui(done)
 
-        threading.Thread(target=runner, daemon=True).start()
+        run_in_pool(runner)
 
     def apply_filter(self) -> None:
+        self._filter_timer.start()
+
+    def _apply_filter_now(self) -> None:
+        self._filter_timer.stop()
         raw = self.search_edit.text()
         terms, mode = self._parse_keywords(raw)
         self._search_cancel.set()
@@ -4970,12 +5778,12 @@ class SessionManagerPage(QtWidgets.QWidget):
             self._apply_list(self._sessions)
             return
 
-        matched = []
-        for item in self._sessions:
-            sid = item.get("id", "")
-            text = self._history_index.get(sid, "")
-            if self._match_text(text, terms, mode):
-                matched.append(item)
+        pairs = zip(self._sessions, self._search_blobs)
+        if mode == "OR":
+            pattern = self._terms_pattern(terms)
+            matched = [item for item, blob in pairs if blob and pattern.search(blob)]
+        else:
+            matched = [item for item, blob in pairs if self._match_text(blob, terms, mode)]
         if matched:
             self.search_status.setText(f"history 命中 {len(matched)} 条。")
             self._hide_search_progress()
@@ -5004,65 +5812,67 @@ class SessionManagerPage(QtWidgets.QWidget):
         if isinstance(data, dict):
             self._render_detail(data)
 
-    def _build_rendered_text(self, meta: dict, only_ua: bool) -> str:
+    def _iter_rendered_blocks(self, meta: dict, only_ua: bool):
         path = meta.get("path", "")
-        if not path:
-            return ""
-        lines = []
-        lines.append(f"时间：{meta.get('time_display', '-')}")
-        lines.append(f"模型：{meta.get('model', '-')}")
-        lines.append(f"分支：{meta.get('branch', '-')}")
-        lines.append(f"目录：{meta.get('cwd', '-')}")
-        lines.append(f"文件：{path}")
-        lines.append("")
+        yield [
+            f"时间：{meta.get('time_display', '-')}",
+            f"模型：{meta.get('model', '-')}",
+            f"分支：{meta.get('branch', '-')}",
+            f"目录：{meta.get('cwd', '-')}",
+            f"文件：{path}",
+            "",
+        ]
         prev_role = None
         separator = "-" * 30
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    if data.get("type") != "response_item":
-                        continue
-                    payload = data.get("payload") or {}
-                    if payload.get("type") != "message":
-                        continue
-                    role = payload.get("role") or ""
-                    if only_ua and role not in ("user", "assistant"):
-                        continue
-                    contents = payload.get("content") or []
-                    text_parts = []
-                    if isinstance(contents, list):
-                        for c in contents:
-                            if not isinstance(c, dict):
-                                continue
-                            ctype = c.get("type")
-                            if ctype in ("input_text", "output_text", "text"):
-                                text_parts.append(c.get("text", ""))
-                            elif ctype and "image" in ctype:
-                                text_parts.append("[image]")
-                    msg = "\n".join([p for p in text_parts if p]).strip()
-                    if not msg:
-                        continue
-                    if prev_role is not None and role != prev_role:
-                        lines.append(separator)
-                    lines.append(f"[{role}]")
-                    lines.append(msg)
-                    lines.append("")
-                    prev_role = role
+            messages = self._extract_session_messages(path)
         except Exception as exc:
-            lines.append(f"读取失败：{exc}")
+            yield [f"读取失败：{exc}"]
+            return
+        for role, msg in messages:
+            if only_ua and role not in ("user", "assistant"):
+                continue
+            block = [separator] if prev_role is not None and role != prev_role else []
+            block.extend((f"[{role}]", msg, ""))
+            prev_role = role
+            yield block
+
+    def _build_rendered_text(self, meta: dict, only_ua: bool) -> str:
+        if not meta.get("path", ""):
+            return ""
+        lines = [line for block in self._iter_rendered_blocks(meta, only_ua) for line in block]
         return "\n".join(lines).strip()
 
+    def _reset_detail_paging(self) -> None:
+        self._detail_blocks = None
+        self.detail_more_btn.setVisible(False)
+
+    def _append_detail_blocks(self) -> None:
+        blocks = self._detail_blocks
+        if blocks is None:
+            return
+        first_page = self.detail_text.document().isEmpty()
+        page_size = self._DETAIL_PAGE_SIZE + 1 if first_page else self._DETAIL_PAGE_SIZE
+        lines = [line for block in itertools.islice(blocks, page_size) for line in block]
+        pending = next(blocks, None)
+        self._detail_blocks = None if pending is None else itertools.chain([pending], blocks)
+        text = "\n".join(lines)
+        if first_page:
+            self.detail_text.setPlainText(text.strip())
+        else:
+            cursor = QtGui.QTextCursor(self.detail_text.document())
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.insertText("\n\n" + text.rstrip())
+        self.detail_more_btn.setVisible(self._detail_blocks is not None)
+
     def _render_detail(self, meta: dict) -> None:
         path = meta.get("path", "")
         if not path:
             return
         only_ua = self.only_ua_check.isChecked()
-        content = self._build_rendered_text(meta, only_ua)
-        self.detail_text.setPlainText(content)
+        self.detail_text.clear()
+        self._detail_blocks = self._iter_rendered_blocks(meta, only_ua)
+        self._append_detail_blocks()
 
     def _show_session_menu(self, pos) -> None:
         item = self.list_widget.itemAt(pos)
@@ -5284,7 +6094,7 @@ class SessionManagerPage(QtWidgets.QWidget):
     def _launch_vscode_for_session(self, cwd: str, sid: str = "") -> None:
         code_cli = self._find_vscode_cli()
         args = None
-        if code_cli and self._vscode_supports_command(code_cli):
+        if code_cli and vscode_supports_command(self.state, code_cli):
             args = [code_cli, "-r", cwd, "--command", "chatgpt.openSidebar"]
         else:
             if code_cli:
@@ -5333,13 +6143,10 @@ class SessionManagerPage(QtWidgets.QWidget):
         return None
 
     def _find_vscode_exe_in_dir(self, root: Path) -> Optional[str]:
-        candidates = [
-            root / "Code.exe",
-            root / "Code - Insiders.exe",
-        ]
-        for candidate in candidates:
-            if candidate.is_file():
-                return str(candidate)
+        for exe_name in ("Code.exe", "Code - Insiders.exe"):
+            candidate = os.path.join(root, exe_name)
+            if os.path.isfile(candidate):
+                return candidate
         return None
 
     def _find_vscode_exe(self) -> Optional[str]:
@@ -5350,36 +6157,32 @@ class SessionManagerPage(QtWidgets.QWidget):
                 exe = self._find_vscode_exe_in_dir(root)
                 if exe:
                     return exe
-        candidates = []
+        bases: List[str] = []
         local = os.environ.get("LOCALAPPDATA")
         program = os.environ.get("ProgramFiles") or os.environ.get("PROGRAMFILES")
         program_x86 = os.environ.get("ProgramFiles(x86)") or os.environ.get("PROGRAMFILES(X86)")
         if local:
-            candidates.append(Path(local) / "Programs" / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(local) / "Programs" / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
+            bases.append(os.path.join(local, "Programs"))
         if program:
-            candidates.append(Path(program) / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(program) / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
+            bases.append(program)
         if program_x86:
-            candidates.append(Path(program_x86) / "Microsoft VS Code" / "Code.exe")
-            candidates.append(Path(program_x86) / "Microsoft VS Code Insiders" / "Code - Insiders.exe")
-        for candidate in candidates:
-            if candidate.is_file():
-                return str(candidate)
+            bases.append(program_x86)
+        installs = (("Microsoft VS Code", "Code.exe"), ("Microsoft VS Code Insiders", "Code - Insiders.exe"))
+        for base in bases:
+            for folder, exe_name in installs:
+                candidate = os.path.join(base, folder, exe_name)
+                if os.path.isfile(candidate):
+                    return candidate
         return None
 
-    def _vscode_supports_command(self, code_cli: str) -> bool:
+    def _load_jsonc(self, text: str) -> dict:
         try:
-            creationflags = 0x08000000 if os.name == "nt" else 0
-            proc = subprocess.run([code_cli, "--help"], capture_output=True, text=True, timeout=3, creationflags=creationflags)
+            data = json.loads(text)
+            if isinstance(data, dict):
+                return data
         except Exception:
-            return False
-        output = (proc.stdout or "") + (proc.stderr or "")
-        return "--command" in output
-
-    def _load_jsonc(self, text: str) -> dict:
-        no_block = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
-        no_line = re.sub(r"//.*", "", no_block)
+            pass
+        no_line = strip_jsonc_comments(text)
         try:
             return json.loads(no_line) if no_line.strip() else {}
         except Exception:
@@ -5406,84 +6209,84 @@ class SessionManagerPage(QtWidgets.QWidget):
             "ServiceHub.Host.Node.x64.exe",
             "ServiceHub.TestWindowStoreHost.exe",
         ]
+        args = ["taskkill", "/F", "/T"]
         for name in targets:
-            try:
-                subprocess.run(["taskkill", "/F", "/T", "/IM", name], capture_output=True, text=True)
-            except Exception:
-                continue
+            args.extend(("/IM", name))
+        try:
+            subprocess.run(
+                args,
+                capture_output=True,
+                text=True,
+                creationflags=0x08000000 if os.name == "nt" else 0,
+            )
+        except Exception:
+            return
 
     def _clear_vscode_cache(self, install_dir: Optional[Path] = None) -> None:
         appdata = os.environ.get("APPDATA")
         local = os.environ.get("LOCALAPPDATA")
-        paths = []
+        join = os.path.join
+        paths: List[str] = []
         channel = None
         portable_user_data = None
         if install_dir:
-            if (install_dir / "Code - Insiders.exe").is_file():
+            install = str(install_dir)
+            if os.path.isfile(join(install, "Code - Insiders.exe")):
                 channel = "insiders"
-            elif (install_dir / "Code.exe").is_file():
+            elif os.path.isfile(join(install, "Code.exe")):
                 channel = "stable"
-            portable_root = install_dir / "data" / "user-data"
-            if portable_root.is_dir():
+            portable_root = join(install, "data", "user-data")
+            if os.path.isdir(portable_root):
                 portable_user_data = portable_root
         if portable_user_data:
-            base = portable_user_data
-            paths += [
-                base / "WebView",
-                base / "CachedData",
-                base / "Cache",
-                base / "GPUCache",
-                base / "Local Storage",
-                base / "Service Worker" / "CacheStorage",
-                base / "Service Worker" / "ScriptCache",
-                base / "User" / "workspaceStorage",
-                base / "User" / "globalStorage",
-            ]
+            paths += [join(portable_user_data, *sub) for sub in _VSCODE_APPDATA_SUBS + _VSCODE_LOCAL_SUBS]
         else:
-            if channel == "stable":
-                names = ["Code"]
-            elif channel == "insiders":
-                names = ["Code - Insiders"]
-            else:
-                names = ["Code", "Code - Insiders"]
+            names = _VSCODE_CHANNEL_NAMES[channel]
             if appdata:
-                base = Path(appdata)
                 for name in names:
-                    root = base / name
-                    paths += [
-                        root / "WebView",
-                        root / "CachedData",
-                        root / "Cache",
-                        root / "GPUCache",
-                        root / "Local Storage",
-                        root / "Service Worker" / "CacheStorage",
-                        root / "Service Worker" / "ScriptCache",
-                    ]
+                    root = join(appdata, name)
+                    if os.path.isdir(root):
+                        paths += [join(root, *sub) for sub in _VSCODE_APPDATA_SUBS]
             if local:
-                base = Path(local) / "Microsoft"
-                if channel == "stable":
-                    local_names = ["Code"]
-                elif channel == "insiders":
-                    local_names = ["Code - Insiders"]
-                else:
-                    local_names = ["Code", "Code - Insiders"]
-                for name in local_names:
-                    root = base / name
-                    paths += [
-                        root / "User" / "workspaceStorage",
-                        root / "User" / "globalStorage",
-                    ]
-                paths.append(Path(local) / "Temp" / "Code")
-        for p in paths:
+                for name in names:
+                    root = join(local, "Microsoft", name)
+                    if os.path.isdir(root):
+                        paths += [join(root, *sub) for sub in _VSCODE_LOCAL_SUBS]
+                paths.append(join(local, "Temp", "Code"))
+        def remove(p: str) -> None:
             try:
-                if p.is_dir():
+                st = os.lstat(p)
+            except OSError:
+                return
+            try:
+                if stat.S_ISDIR(st.st_mode):
                     shutil.rmtree(p, ignore_errors=True)
-                elif p.exists():
-                    p.unlink(missing_ok=True)
+                else:
+                    os.unlink(p)
             except Exception:
-                continue
+                return
+
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+            list(pool.map(remove, paths))
+
+    def _set_exporting(self, busy: bool) -> None:
+        self.exporting = busy
+        self.export_json_btn.setEnabled(not busy)
+        self.export_md_btn.setEnabled(not busy)
+
+    def _finish_export(self, file_path: str, error: str) -> None:
+        self._set_exporting(False)
+        if error:
+            message_error(self, "失败", error)
+        else:
+            message_info(self, "完成", f"已导出：{file_path}")
 
     def export_json(self) -> None:
+        if self.exporting:
+            return
         item = self.list_widget.currentItem()
         if not item:
             message_warn(self, "提示", "请先选择会话")
@@ -5498,34 +6301,43 @@ class SessionManagerPage(QtWidgets.QWidget):
         if not file_path:
             return
         only_ua = self.only_ua_check.isChecked()
-        items = []
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    if not only_ua:
-                        items.append(data)
-                        continue
-                    if data.get("type") == "session_meta":
-                        items.append(data)
-                        continue
-                    if data.get("type") != "response_item":
-                        continue
-                    payload = data.get("payload") or {}
-                    role = payload.get("role") or ""
-                    if role in ("user", "assistant"):
-                        items.append(data)
-            rendered_text = self._build_rendered_text(meta, only_ua)
-            payload = {"items": items, "rendered_text": rendered_text}
-            with open(file_path, "w", encoding="utf-8") as out:
-                json.dump(payload, out, ensure_ascii=False, indent=2)
-        except Exception as exc:
-            message_error(self, "失败", str(exc))
+        self._set_exporting(True)
+
+        def runner() -> None:
+            error = ""
+            try:
+                with open(path, "rb", buffering=0) as fh, open(file_path, "wb") as out:
+                    out.write(b'{\n  "items": [')
+                    sep = b"\n    "
+                    write = out.write
+                    for line in iter_jsonl_lines(fh):
+                        if only_ua and b'"response_item"' not in line and b'"session_meta"' not in line:
+                            continue
+                        data = json_loads_bytes(line)
+                        if only_ua:
+                            kind = data.get("type")
+                            if kind == "response_item":
+                                if (data.get("payload") or {}).get("role") not in ("user", "assistant"):
+                                    continue
+                            elif kind != "session_meta":
+                                continue
+                        write(sep)
+                        write(json_dumps_bytes(data, indent=True).replace(b"\n", b"\n    "))
+                        sep = b",\n    "
+                    out.write(b"\n  ]," if sep != b"\n    " else b"],")
+                    rendered_text = self._build_rendered_text(meta, only_ua)
+                    out.write(b'\n  "rendered_text": ')
+                    out.write(json_dumps_bytes(rendered_text))
+                    out.write(b"\n}")
+            except Exception as exc:
+                error = str(exc)
+            run_in_ui(lambda: self._finish_export(file_path, error))
+
+        run_in_pool(runner)
 
     def export_markdown(self) -> None:
+        if self.exporting:
+            return
         item = self.list_widget.currentItem()
         if not item:
             message_warn(self, "提示", "请先选择会话")
@@ -5536,13 +6348,20 @@ class SessionManagerPage(QtWidgets.QWidget):
         file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "导出 Markdown", "session.md", "Markdown (*.md)")
         if not file_path:
             return
-        try:
-            only_ua = self.only_ua_check.isChecked()
-            content = self._build_rendered_text(meta, only_ua)
-            with open(file_path, "w", encoding="utf-8") as out:
-                out.write(content)
-        except Exception as exc:
-            message_error(self, "失败", str(exc))
+        only_ua = self.only_ua_check.isChecked()
+        self._set_exporting(True)
+
+        def runner() -> None:
+            error = ""
+            try:
+                content = self._build_rendered_text(meta, only_ua)
+                with open(file_path, "w", encoding="utf-8") as out:
+                    out.write(content)
+            except Exception as exc:
+                error = str(exc)
+            run_in_ui(lambda: self._finish_export(file_path, error))
+
+        run_in_pool(runner)
 
     def run_cleanup(self) -> None:
         mode = self.clean_mode.currentIndex()
@@ -5594,19 +6413,26 @@ class SessionManagerPage(QtWidgets.QWidget):
         history = Path.home() / ".codex" / "history.jsonl"
         if not history.exists():
             return
+        needles = [sid.encode("utf-8") for sid in deleted_ids if sid]
+        if not needles:
+            return
         tmp = history.with_suffix(".jsonl.tmp")
         try:
-            with history.open("r", encoding="utf-8", errors="ignore") as fh, tmp.open("w", encoding="utf-8") as out:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    sid = data.get("session_id") or ""
-                    if sid in deleted_ids:
-                        continue
-                    out.write(json.dumps(data, ensure_ascii=False) + "\n")
+            with history.open("rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    if not any(buf.find(needle) != -1 for needle in needles):
+                        return
+            with history.open("rb", buffering=0) as fh, tmp.open("wb", buffering=1 << 20) as out:
+                for line in iter_jsonl_lines(fh):
+                    if any(needle in line for needle in needles):
+                        data = json_loads_bytes(line)
+                        if (data.get("session_id") or "") in deleted_ids:
+                            continue
+                    out.write(line + b"\n")
             tmp.replace(history)
+            self._history_state = {}
         except Exception:
             return
 
@@ -5664,11 +6490,12 @@ class OpenAIStatusPage(QtWidgets.QWidget):
 
         self._status_url = "https://status.openai.com"
         self._status_checked = False
+        self._status_etag = ""
+        self._status_last_modified = ""
+        self._cached_html = ""
 
     def _header_font(self) -> QtGui.QFont:
-        font = QtGui.QFont("Segoe UI", 12)
-        font.setBold(True)
-        return font
+        return header_font()
 
     def on_show(self) -> None:
         if not self._status_checked:
@@ -5703,19 +6530,26 @@ class OpenAIStatusPage(QtWidgets.QWidget):
 
     def _get_status_summary(self) -> str:
         api_url = "https://status.openai.com/api/v2/summary.json"
-        req = urllib_request.Request(api_url, headers={"User-Agent": "CodexSwitcher"})
-        with urllib_request.urlopen(req, timeout=6) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        req = urllib_request.Request(api_url, headers={"User-Agent": "CodexSwitcher", "Accept-Encoding": "gzip"})
+        if self._cached_html:
+            if self._status_etag:
+                req.add_header("If-None-Match", self._status_etag)
+            if self._status_last_modified:
+                req.add_header("If-Modified-Since", self._status_last_modified)
+        try:
+            with urllib_request.urlopen(req, timeout=6) as resp:
+                body = resp.read()
+                resp_headers = resp.headers
+        except urllib_error.HTTPError as exc:
+            if exc.code == 304 and self._cached_html:
+                return self._cached_html
+            raise
+        if resp_headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        data = json_loads_bytes(body)
         if not isinstance(data, dict):
             return "无法解析状态数据。"
 
-        comp_map = {}
-        for comp in data.get("components", []) or []:
-            if isinstance(comp, dict):
-                name = comp.get("name")
-                if isinstance(name, str):
-                    comp_map[name] = comp
-
         status = data.get("status") or {}
         indicator = status.get("indicator") or "-"
         desc = status.get("description") or "-"
@@ -5732,16 +6566,18 @@ class OpenAIStatusPage(QtWidgets.QWidget):
 
         abnormal: list[tuple[str, str]] = []
         normal: list[str] = []
-        for comp in data.get("components", []) or []:
+        prefixes: dict[str, str] = {}
+        for comp in data.get("components") or []:
             if not isinstance(comp, dict):
                 continue
             name = comp.get("name")
             if not isinstance(name, str):
                 continue
             raw_status = comp.get("status", "unknown")
-            status_text = STATUS_TEXT.get(raw_status, raw_status)
-            line = f"- [{status_text}] {name}"
-            line = html.escape(line)
+            prefix = prefixes.get(raw_status)
+            if prefix is None:
+                prefix = prefixes[raw_status] = html.escape(f"- [{STATUS_TEXT.get(raw_status, raw_status)}] ")
+            line = prefix + html.escape(name)
             if raw_status == "operational":
                 normal.append(line)
             else:
@@ -5757,7 +6593,11 @@ class OpenAIStatusPage(QtWidgets.QWidget):
         html_lines.append("<b>组件状态：</b>")
         html_lines.extend(normal)
 
-        return "<br>".join(html_lines).strip()
+        content = "<br>".join(html_lines).strip()
+        self._status_etag = resp_headers.get("ETag") or ""
+        self._status_last_modified = resp_headers.get("Last-Modified") or ""
+        self._cached_html = content
+        return content
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self) -> None:
@@ -5782,22 +6622,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.stack = QtWidgets.QStackedWidget()
         root.addWidget(self.stack, 1)
 
-        self.pages = {}
-        self.pages["account"] = AccountPage(self.state)
-        if hasattr(self.pages["account"], "refresh_pages"):
-            self.pages["account"].refresh_pages = self.refresh_pages
-        self.pages["config_toml"] = ConfigTomlPage(self.state)
-        self.pages["opencode"] = OpencodeConfigPage(self.state)
-        self.pages["network"] = NetworkDiagnosticsPage(self.state)
-        self.pages["codex_status"] = CodexStatusPage(self.state)
-        self.pages["vscode_plugin"] = VSCodePluginPage(self.state)
-        self.pages["skills"] = SkillsPage(self.state)
-        self.pages["settings"] = SettingsPage(self.state, on_update_count_changed=self._on_update_count_changed)
-        self.pages["openai_status"] = OpenAIStatusPage(self.state)
-        self.pages["sessions"] = SessionManagerPage(self.state)
-
-        for page in self.pages.values():
-            self.stack.addWidget(page)
+        self._page_factories: Dict[str, Callable[[], QtWidgets.QWidget]] = {
+            "account": lambda: AccountPage(self.state, refresh_pages=self.refresh_pages),
+            "config_toml": lambda: ConfigTomlPage(self.state),
+            "opencode": lambda: OpencodeConfigPage(self.state),
+            "network": lambda: NetworkDiagnosticsPage(self.state),
+            "codex_status": lambda: CodexStatusPage(self.state),
+            "vscode_plugin": lambda: VSCodePluginPage(self.state),
+            "skills": lambda: SkillsPage(self.state),
+            "settings": lambda: SettingsPage(self.state, on_update_count_changed=self._on_update_count_changed),
+            "openai_status": lambda: OpenAIStatusPage(self.state),
+            "sessions": lambda: SessionManagerPage(self.state),
+        }
+        self.pages: Dict[str, Optional[QtWidgets.QWidget]] = dict.fromkeys(self._page_factories)
 
         self.buttons = []
         self._nav_button_map: Dict[str, QtWidgets.QPushButton] = {}
@@ -5818,10 +6655,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_check_timer.setInterval(15 * 60 * 1000)
         self._update_check_timer.timeout.connect(self._auto_check_updates)
         self._update_check_timer.start()
-        QtCore.QTimer.singleShot(1200, self._auto_check_updates)
+        self._did_first_check = False
 
         self.show_page("account")
 
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        if not self._did_first_check:
+            self._did_first_check = True
+            QtCore.QTimer.singleShot(0, self._auto_check_updates)
+
     def _add_nav_button(self, layout: QtWidgets.QVBoxLayout, label: str, key: str) -> None:
         if key == "settings":
             btn = NavBadgeButton(label)
@@ -5834,8 +6677,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.buttons.append((key, btn))
         self._nav_button_map[key] = btn
 
-    def show_page(self, key: str) -> None:
+    def _get_page(self, key: str) -> Optional[QtWidgets.QWidget]:
         page = self.pages.get(key)
+        if page is None:
+            factory = self._page_factories.get(key)
+            if factory is None:
+                return None
+            page = factory()
+            self.pages[key] = page
+            self.stack.addWidget(page)
+        return page
+
+    def show_page(self, key: str) -> None:
+        page = self._get_page(key)
         if not page:
             return
         self.stack.setCurrentWidget(page)
@@ -5846,11 +6700,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def refresh_pages(self) -> None:
         for page in self.pages.values():
-            if hasattr(page, "on_show"):
+            if page is not None and hasattr(page, "on_show"):
                 getattr(page, "on_show")()
 
     def _auto_check_updates(self) -> None:
-        page = self.pages.get("settings")
+        page = self._get_page("settings")
         if isinstance(page, SettingsPage):
             page.check_update(auto=True)
 
@@ -5886,71 +6740,18 @@ def apply_light_theme(app: QtWidgets.QApplication) -> None:
     palette.setColor(QtGui.QPalette.HighlightedText, QtGui.QColor(255, 255, 255))
     app.setPalette(palette)
 
-    app.setStyleSheet(
-        """
-        QWidget#appRoot {
-            background: qlineargradient(
-                x1: 0, y1: 0, x2: 1, y2: 1,
-                stop: 0 #F4A3D6, stop: 0.4 #F1A7E0, stop: 0.8 #C5B2FF, stop: 1 #A8D6FF
-            );
-        }
-        QLabel {
-            color: #2C2540;
-        }
-        QGroupBox {
-            border: 1px solid #FFFFFF;
-            border-radius: 8px;
-            margin-top: 10px;
-            background-color: rgba(255, 255, 255, 200);
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            subcontrol-position: top left;
-            padding: 0 8px;
-            color: #2C2540;
-            background: transparent;
-        }
-        QLineEdit, QPlainTextEdit, QListWidget, QTableWidget {
-            border: 1px solid rgba(108, 99, 255, 150);
-            border-radius: 6px;
-            background: rgba(255, 255, 255, 230);
-            color: #2C2540;
-        }
-        QLineEdit:focus, QPlainTextEdit:focus, QListWidget:focus, QTableWidget:focus {
-            border: 1px solid rgba(108, 99, 255, 220);
-        }
-        QPushButton {
-            background: rgba(255, 255, 255, 220);
-            border: 1px solid rgba(108, 99, 255, 140);
-            border-radius: 6px;
-            padding: 4px 10px;
-            color: #2C2540;
-        }
-        QPushButton:hover {
-            border: 1px solid rgba(108, 99, 255, 200);
-        }
-        QPushButton:checked {
-            background: rgba(108, 99, 255, 40);
-            border: 1px solid rgba(108, 99, 255, 220);
-        }
-        QHeaderView::section {
-            background-color: rgba(255, 255, 255, 200);
-            border: 1px solid rgba(108, 99, 255, 140);
-            padding: 4px 6px;
-            color: #2C2540;
-        }
-"""
-    )
-
 
 def main() -> None:
     app = QtWidgets.QApplication(sys.argv)
-    if not apply_material_theme(app):
+    material = apply_material_theme(app)
+    if not material:
         apply_light_theme(app)
     icon_path = resolve_asset("icon_tray.png")
     if icon_path.exists():
         app.setWindowIcon(QtGui.QIcon(str(icon_path)))
     window = MainWindow()
+    if not material:
+        app.setStyleSheet(theme_qss())
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,80 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pyside_switcher
+
+
+class DisableUpdateFlagsTests(unittest.TestCase):
+    def _build_subject(self, paths=()):
+        obj = SimpleNamespace()
+        cls = pyside_switcher.VSCodePluginPage
+        for name in ("_load_jsonc", "_disable_update_flags_in_text", "disable_auto_update"):
+            setattr(obj, name, getattr(cls, name).__get__(obj, SimpleNamespace))
+        obj._settings_paths = lambda: list(paths)
+        obj.status_label = mock.Mock()
+        return obj
+
+    def test_rewrites_existing_keys_in_place(self):
+        subject = self._build_subject()
+        text = (
+            '{\n  // keep this comment\n  "extensions.autoUpdate": "onlyEnabledExtensions",\n'
+            '  "extensions.autoCheckUpdates": true,\n  "editor.fontSize": 14\n}'
+        )
+
+        patched = subject._disable_update_flags_in_text(text)
+
+        self.assertIsNotNone(patched)
+        self.assertIn("// keep this comment", patched)
+        self.assertIn('"extensions.autoUpdate": false', patched)
+        self.assertIn('"extensions.autoCheckUpdates": false', patched)
+        self.assertIn('"editor.fontSize": 14', patched)
+
+    def test_inserts_missing_keys_after_opening_brace(self):
+        subject = self._build_subject()
+        text = '{\n  "extensions.autoUpdate": true,\n  "editor.fontSize": 14\n}'
+
+        patched = subject._disable_update_flags_in_text(text)
+
+        data = json.loads(patched)
+        self.assertIs(data["extensions.autoUpdate"], False)
+        self.assertIs(data["extensions.autoCheckUpdates"], False)
+        self.assertEqual(data["editor.fontSize"], 14)
+
+    def test_already_disabled_text_is_returned_unchanged(self):
+        subject = self._build_subject()
+        text = '{"extensions.autoUpdate": false, "extensions.autoCheckUpdates": false}'
+
+        self.assertEqual(subject._disable_update_flags_in_text(text), text)
+
+    def test_returns_none_for_empty_object_and_non_object_roots(self):
+        subject = self._build_subject()
+        for text in ("", "{}", "{ \n }", "[]", '[{"a": 1}]', "42"):
+            with self.subTest(text=text):
+                self.assertIsNone(subject._disable_update_flags_in_text(text))
+
+    def test_disable_auto_update_falls_back_to_full_rewrite(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            empty = Path(tmp) / "empty.json"
+            empty.write_text("{}", encoding="utf-8")
+            commented = Path(tmp) / "commented.json"
+            commented.write_text('{\n  // note\n  "extensions.autoUpdate": true\n}', encoding="utf-8")
+            subject = self._build_subject([empty, commented])
+
+            with mock.patch.object(pyside_switcher, "message_warn") as warn:
+                subject.disable_auto_update()
+
+            warn.assert_not_called()
+            subject.status_label.setText.assert_called_once()
+            self.assertEqual(
+                json.loads(empty.read_text(encoding="utf-8")),
+                {"extensions.autoUpdate": False, "extensions.autoCheckUpdates": False},
+            )
+            self.assertIn("// note", commented.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtWidgets
+
+import pyside_switcher
+
+
+def _bind(obj, name):
+    return getattr(pyside_switcher.SessionManagerPage, name).__get__(obj, SimpleNamespace)
+
+
+class SessionDetailPagingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def _page(self, message_count):
+        messages = [("user", f"msg-{i}") for i in range(message_count)]
+        page = SimpleNamespace(
+            _DETAIL_PAGE_SIZE=pyside_switcher.SessionManagerPage._DETAIL_PAGE_SIZE,
+            _detail_blocks=None,
+            _extract_session_messages=lambda path: messages,
+            detail_text=QtWidgets.QPlainTextEdit(),
+            detail_more_btn=QtWidgets.QPushButton(),
+            only_ua_check=QtWidgets.QCheckBox(),
+        )
+        for name in ("_iter_rendered_blocks", "_append_detail_blocks", "_render_detail"):
+            setattr(page, name, _bind(page, name))
+        page._render_detail({"path": "session.jsonl"})
+        return page
+
+    def _shown(self, page):
+        return [line for line in page.detail_text.toPlainText().splitlines() if line.startswith("msg-")]
+
+    def test_first_page_shows_full_page_of_messages(self):
+        size = pyside_switcher.SessionManagerPage._DETAIL_PAGE_SIZE
+        page = self._page(size + 20)
+
+        shown = self._shown(page)
+        self.assertEqual(len(shown), size)
+        self.assertEqual(shown[-1], f"msg-{size - 1}")
+        self.assertTrue(page.detail_text.toPlainText().startswith("时间："))
+        self.assertIsNotNone(page._detail_blocks)
+
+        page._append_detail_blocks()
+
+        self.assertEqual(len(self._shown(page)), size + 20)
+        self.assertIsNone(page._detail_blocks)
+
+    def test_exact_page_size_has_no_more_pages(self):
+        size = pyside_switcher.SessionManagerPage._DETAIL_PAGE_SIZE
+        page = self._page(size)
+
+        self.assertEqual(len(self._shown(page)), size)
+        self.assertIsNone(page._detail_blocks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import unittest
+
+import pyside_switcher
+
+
+class IterJsonlLinesTests(unittest.TestCase):
+    def _lines(self, data, chunk_size):
+        return list(pyside_switcher.iter_jsonl_lines(io.BytesIO(data), chunk_size=chunk_size))
+
+    def test_splits_lines_across_chunk_boundaries(self):
+        data = b'{"a":1}\n{"b":2}\r\n\n  \n{"c":3}'
+        expected = [b'{"a":1}', b'{"b":2}', b'{"c":3}']
+        for chunk_size in (1, 2, 3, 7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self._lines(data, chunk_size), expected)
+
+    def test_long_line_spanning_many_chunks(self):
+        long_line = b'{"text":"' + b"x" * 5000 + b'"}'
+
+        self.assertEqual(self._lines(long_line + b"\n" + b"{}\n", 64), [long_line, b"{}"])
+
+    def test_empty_and_blank_input(self):
+        for data in (b"", b"\n", b"\n \r\n\t\n"):
+            with self.subTest(data=data):
+                self.assertEqual(self._lines(data, 4), [])
+
+
+class ExtractMessageTextTests(unittest.TestCase):
+    def test_joins_text_parts_and_marks_images(self):
+        contents = [
+            {"type": "input_text", "text": "hello"},
+            {"type": "input_image", "image_url": "data:..."},
+            {"type": "output_text", "text": "world"},
+            {"type": "text", "text": ""},
+            {"type": "tool_call", "text": "ignored"},
+            "not a dict",
+        ]
+
+        self.assertEqual(pyside_switcher.extract_message_text(contents), "hello\n[image]\nworld")
+
+    def test_non_list_content_yields_empty_text(self):
+        for contents in (None, "text", {"type": "input_text", "text": "x"}, []):
+            with self.subTest(contents=contents):
+                self.assertEqual(pyside_switcher.extract_message_text(contents), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+import pyside_switcher
+
+
+class StripJsoncCommentsTests(unittest.TestCase):
+    def test_removes_line_and_block_comments(self):
+        text = '{\n  // line comment\n  "a": 1, /* block */ "b": 2\n}'
+
+        stripped = pyside_switcher.strip_jsonc_comments(text)
+
+        self.assertEqual(json.loads(stripped), {"a": 1, "b": 2})
+        self.assertNotIn("comment", stripped)
+        self.assertNotIn("block", stripped)
+
+    def test_keeps_comment_markers_inside_strings(self):
+        text = '{"url": "https://example.com/a//b", "glob": "src/**/*.js", "c": "/* not a comment */"}'
+
+        stripped = pyside_switcher.strip_jsonc_comments(text)
+
+        self.assertEqual(stripped, text)
+
+    def test_handles_escaped_quotes_inside_strings(self):
+        text = '{"a": "say \\"hi\\" // still string", "b": "ends with backslash \\\\"} // tail'
+
+        stripped = pyside_switcher.strip_jsonc_comments(text)
+
+        self.assertEqual(
+            json.loads(stripped),
+            {"a": 'say "hi" // still string', "b": "ends with backslash \\"},
+        )
+        self.assertNotIn("tail", stripped)
+
+    def test_unterminated_block_comment_drops_rest_of_text(self):
+        text = '{"a": 1} /* never closed\n"b": 2'
+
+        stripped = pyside_switcher.strip_jsonc_comments(text)
+
+        self.assertEqual(stripped, '{"a": 1} ')
+
+    def test_unterminated_string_is_kept_verbatim(self):
+        text = '{"a": "open // not a comment'
+
+        stripped = pyside_switcher.strip_jsonc_comments(text)
+
+        self.assertEqual(stripped, text)
+
+    def test_lone_slash_and_text_without_comments_are_unchanged(self):
+        for text in ("", "{}", '{"ratio": 1}/2', "no quotes or comments"):
+            with self.subTest(text=text):
+                self.assertEqual(pyside_switcher.strip_jsonc_comments(text), text)
+
+
+if __name__ == "__main__":
+    unittest.main()